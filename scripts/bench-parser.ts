@@ -0,0 +1,145 @@
+/**
+ * Streaming spec parser benchmark
+ *
+ * Generates a synthetic Markdown spec corpus (default 100 MB in 8 files),
+ * then parses it with the single-threaded stream and with the worker pool.
+ * Each mode runs in its own process so peak RSS is measured independently.
+ *
+ * Usage: npm run bench:parser [-- --size-mb 100 --files 8 --workers 4]
+ */
+import { spawnSync } from "child_process";
+import { mkdtempSync, rmSync, createWriteStream, statSync } from "fs";
+import { tmpdir, cpus } from "os";
+import { join } from "path";
+import { fileURLToPath } from "url";
+import { streamSpecRecords, streamSpecRecordsParallel } from "../dist/index.js";
+
+function arg(name: string, fallback: string): string {
+  const index = process.argv.indexOf(`--${name}`);
+  return index > 0 ? process.argv[index + 1] : fallback;
+}
+
+const SIZE_MB = Number(arg("size-mb", "100"));
+const FILES = Number(arg("files", "8"));
+const WORKERS = Number(arg("workers", String(cpus().length)));
+
+function section(i: number): string {
+  return `## Resource ${i}
+
+### Resource${i} Model
+
+Resource ${i} generated from an OpenAPI schema.
+
+| Field | Type | Required | Description |
+|-------|------|----------|-------------|
+| id | string (UUID) | Yes | Identifier of resource ${i} |
+| name | string | Yes | Display name |
+| ownerId | string | No | Owner user ID |
+| createdAt | datetime | Yes | Creation time |
+
+#### POST /api/resources${i}
+
+Create resource ${i}.
+
+**Parameters:**
+
+| Parameter | Type | Required | Description |
+|-----------|------|----------|-------------|
+| name | string | Yes | Display name (1-100 chars) |
+| ownerId | string | No | Owner user ID |
+
+**Response:**
+
+- \`201 Created\`: Resource created
+- \`400 Bad Request\`: Validation error
+
+\`\`\`json
+{ "id": "550e8400-e29b-41d4-a716-446655440000", "name": "resource-${i}" }
+\`\`\`
+
+### Validation Rules
+
+1. Resource ${i} name must be unique
+2. Owner must exist
+
+### Resource ${i} Checklist
+
+- [ ] POST /api/resources${i}
+- [x] Resource${i} model
+
+`;
+}
+
+async function writeCorpus(dir: string): Promise<string[]> {
+  const bytesPerFile = (SIZE_MB * 1024 * 1024) / FILES;
+  const files: string[] = [];
+  let i = 0;
+
+  for (let f = 0; f < FILES; f++) {
+    const path = join(dir, `spec-${f}.md`);
+    const out = createWriteStream(path);
+    let written = 0;
+    out.write(`# Generated Spec ${f}\n\n`);
+    while (written < bytesPerFile) {
+      const chunk = section(i++);
+      written += Buffer.byteLength(chunk);
+      if (!out.write(chunk)) {
+        await new Promise((resolve) => out.once("drain", resolve));
+      }
+    }
+    await new Promise((resolve) => out.end(resolve));
+    files.push(path);
+  }
+  return files;
+}
+
+// 子プロセス: 1 モードだけ実行して結果を JSON で出力
+async function runMode(mode: string, files: string[]): Promise<void> {
+  const start = process.hrtime.bigint();
+  let records = 0;
+
+  if (mode === "stream") {
+    for (const file of files) {
+      for await (const _ of streamSpecRecords(file)) records++;
+    }
+  } else {
+    for await (const _ of streamSpecRecordsParallel(files, { workers: WORKERS })) records++;
+  }
+
+  const seconds = Number(process.hrtime.bigint() - start) / 1e9;
+  console.log(
+    JSON.stringify({ records, seconds, maxRssMb: process.resourceUsage().maxRSS / 1024 })
+  );
+}
+
+const mode = arg("mode", "");
+if (mode) {
+  await runMode(mode, process.argv.slice(process.argv.indexOf("--") + 1));
+} else {
+  const dir = mkdtempSync(join(tmpdir(), "spec2impl-bench-"));
+  try {
+    const files = await writeCorpus(dir);
+    const totalMb = files.reduce((sum, file) => sum + statSync(file).size, 0) / 1024 / 1024;
+    console.log(`Corpus: ${files.length} files, ${totalMb.toFixed(1)} MB`);
+
+    for (const m of ["stream", "workers"]) {
+      const child = spawnSync(
+        process.execPath,
+        [...process.execArgv, fileURLToPath(import.meta.url), "--mode", m,
+          "--workers", String(WORKERS), "--", ...files],
+        { encoding: "utf-8" }
+      );
+      if (child.status !== 0) {
+        throw new Error(`${m} run failed:\n${child.stderr}`);
+      }
+      const result = JSON.parse(child.stdout.trim().split("\n").pop()!);
+      const label = m === "stream" ? "stream (1 thread)" : `workers (${WORKERS})`;
+      console.log(
+        `${label.padEnd(18)} ${(totalMb / result.seconds).toFixed(1).padStart(7)} MB/s  ` +
+          `${result.records} records  peak RSS ${result.maxRssMb.toFixed(0)} MB`
+      );
+    }
+  } finally {
+    rmSync(dir, { recursive: true, force: true });
+  }
+}
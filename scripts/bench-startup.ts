@@ -0,0 +1,67 @@
+/**
+ * CLI startup benchmark
+ *
+ * Measures cold `node dist/cli.js --version` and a no-op re-install
+ * (every template file already up to date) against a millisecond budget.
+ * Exits with code 1 when a median exceeds its budget.
+ *
+ * Usage: npm run bench:startup [-- --runs 20]
+ */
+import { spawnSync } from "child_process";
+import { mkdtempSync, rmSync } from "fs";
+import { tmpdir } from "os";
+import { dirname, join } from "path";
+import { fileURLToPath } from "url";
+
+const __dirname = dirname(fileURLToPath(import.meta.url));
+const CLI = join(__dirname, "..", "dist", "cli.js");
+
+// 起動時間の予算（ミリ秒、中央値）
+const BUDGET_MS = {
+  version: 60,
+  noopInstall: 150,
+};
+
+const runsIndex = process.argv.indexOf("--runs");
+const RUNS = runsIndex > 0 ? Number(process.argv[runsIndex + 1]) : 20;
+
+function runCli(args: string[]): number {
+  const start = process.hrtime.bigint();
+  const result = spawnSync(process.execPath, [CLI, ...args], { stdio: "pipe" });
+  const elapsed = Number(process.hrtime.bigint() - start) / 1e6;
+
+  if (result.status !== 0) {
+    throw new Error(`spec2impl ${args.join(" ")} failed:\n${result.stderr}`);
+  }
+  return elapsed;
+}
+
+function measure(name: keyof typeof BUDGET_MS, args: string[]): boolean {
+  runCli(args); // ウォームアップ（ディスクキャッシュ）
+
+  const samples = Array.from({ length: RUNS }, () => runCli(args)).sort((a, b) => a - b);
+  const median = samples[Math.floor(samples.length / 2)];
+  const p95 = samples[Math.min(samples.length - 1, Math.floor(samples.length * 0.95))];
+  const ok = median <= BUDGET_MS[name];
+
+  console.log(
+    `${ok ? "✔" : "✖"} ${name.padEnd(12)} median ${median.toFixed(1)}ms  ` +
+      `p95 ${p95.toFixed(1)}ms  budget ${BUDGET_MS[name]}ms`
+  );
+  return ok;
+}
+
+const target = mkdtempSync(join(tmpdir(), "spec2impl-bench-"));
+try {
+  runCli([target]); // 初回インストール
+
+  const results = [
+    measure("version", ["--version"]),
+    measure("noopInstall", [target]),
+  ];
+  if (results.includes(false)) {
+    process.exitCode = 1;
+  }
+} finally {
+  rmSync(target, { recursive: true, force: true });
+}
@@ -0,0 +1,22 @@
+/**
+ * Precompute templates/manifest.json (paths, sizes, content hashes)
+ * Run before publishing so installs don't have to hash the template tree
+ */
+import { existsSync } from "fs";
+import { fileURLToPath } from "url";
+import { dirname, join } from "path";
+import { buildManifest, writeManifest, MANIFEST_FILE } from "../src/manifest.js";
+
+const __dirname = dirname(fileURLToPath(import.meta.url));
+const templatesDir = join(__dirname, "..", "templates");
+const templateClaudeDir = join(templatesDir, ".claude");
+
+// テンプレートのないチェックアウトでも build を失敗させない
+if (!existsSync(templateClaudeDir)) {
+  console.warn(`Skipped ${MANIFEST_FILE}: ${templateClaudeDir} does not exist`);
+} else {
+  const manifest = buildManifest(templateClaudeDir);
+  writeManifest(join(templatesDir, MANIFEST_FILE), manifest);
+
+  console.log(`Wrote ${MANIFEST_FILE}: ${manifest.entries.length} files (${manifest.hash.slice(0, 12)})`);
+}
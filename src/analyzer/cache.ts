@@ -0,0 +1,52 @@
+import { dirname } from "path";
+import { existsSync, mkdirSync, readFileSync, writeFileSync } from "fs";
+import type { IoCounter } from "../trace.js";
+import type { SpecAnalysis } from "./types.js";
+
+// パーサーの抽出ルールを変えたら上げる（古いキャッシュを無効化）
+export const PARSER_VERSION = 3;
+
+export interface CachedSpec {
+  hash: string;
+  size: number;
+  mtimeMs: number;
+  analysis: SpecAnalysis;
+}
+
+export interface AnalysisCache {
+  version: 1;
+  parserVersion: number;
+  files: Record<string, CachedSpec>;
+}
+
+export function emptyCache(): AnalysisCache {
+  return { version: 1, parserVersion: PARSER_VERSION, files: {} };
+}
+
+export function readAnalysisCache(cachePath: string, io?: IoCounter): AnalysisCache {
+  io?.count("exists");
+  if (!existsSync(cachePath)) {
+    return emptyCache();
+  }
+
+  io?.count("read");
+  try {
+    const cache = JSON.parse(readFileSync(cachePath, "utf-8")) as AnalysisCache;
+    return cache.version === 1 && cache.parserVersion === PARSER_VERSION && cache.files
+      ? cache
+      : emptyCache();
+  } catch {
+    return emptyCache();
+  }
+}
+
+export function writeAnalysisCache(
+  cachePath: string,
+  cache: AnalysisCache,
+  io?: IoCounter
+): void {
+  mkdirSync(dirname(cachePath), { recursive: true });
+  writeFileSync(cachePath, JSON.stringify(cache) + "\n");
+  io?.count("mkdir");
+  io?.count("write");
+}
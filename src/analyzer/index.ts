@@ -0,0 +1,216 @@
+import { extname, join, relative, resolve, sep } from "path";
+import { readFileSync, readdirSync, statSync } from "fs";
+import { hashContent, tryStat } from "../manifest.js";
+import {
+  ANALYZE_PHASES,
+  Tracer,
+  span,
+  traceEnabled,
+  type AnalyzeMetrics,
+  type AnalyzePhase,
+  type IoCounter,
+} from "../trace.js";
+import { readAnalysisCache, writeAnalysisCache } from "./cache.js";
+import {
+  applyRecord,
+  domainOf,
+  emptyAnalysis,
+  parseMarkdownSpec,
+} from "./markdown-parser.js";
+import type { SpecAnalysis } from "./types.js";
+
+export * from "./types.js";
+export { MarkdownSpecParser, parseMarkdownSpec } from "./markdown-parser.js";
+export {
+  analyzeSpecFiles,
+  readLines,
+  streamSpecRecords,
+  streamSpecRecordsParallel,
+} from "./stream.js";
+export type { SourcedRecord, StreamOptions } from "./stream.js";
+
+// 解析結果キャッシュ（.claude/ 配下、仕様書ごとに内容ハッシュで管理）
+export const ANALYSIS_CACHE_FILE = ".spec2impl-analysis-cache.json";
+
+export interface AnalyzeOptions {
+  /** Project root used for the cache location and relative sources (default: cwd) */
+  projectRoot?: string;
+  /** Read and update .claude/ analysis cache (default: true) */
+  cache?: boolean;
+  /** Collect AnalyzeResult.metrics (default: SPEC2IMPL_TRACE is set) */
+  trace?: boolean;
+}
+
+export interface AnalyzeResult {
+  /** One analysis per Markdown file, sorted by path */
+  analyses: SpecAnalysis[];
+  /** All analyses merged into one */
+  merged: SpecAnalysis;
+  /** Files parsed in this run */
+  parsed: string[];
+  /** Files whose analysis came from the cache */
+  cached: string[];
+  /** Phase timings and I/O counts, only when tracing is enabled */
+  metrics?: AnalyzeMetrics;
+}
+
+function toPosix(path: string): string {
+  return sep === "/" ? path : path.split(sep).join("/");
+}
+
+// 仕様書の探索で辿らないディレクトリ（.git / .claude などのドットディレクトリも除外）
+const IGNORED_DIRS = new Set(["node_modules"]);
+
+/**
+ * List Markdown files under a path (or the path itself if it is a file)
+ * Dot-directories and node_modules below the path are not searched.
+ */
+function findMarkdownFiles(path: string, io?: IoCounter): string[] {
+  io?.count("stat");
+  if (!statSync(path).isDirectory()) {
+    return [path];
+  }
+
+  const files: string[] = [];
+  io?.count("readdir");
+  for (const dirent of readdirSync(path, { withFileTypes: true })) {
+    const fullPath = join(path, dirent.name);
+    if (dirent.isDirectory()) {
+      if (dirent.name.startsWith(".") || IGNORED_DIRS.has(dirent.name)) {
+        continue;
+      }
+      files.push(...findMarkdownFiles(fullPath, io));
+    } else if (extname(dirent.name).toLowerCase() === ".md") {
+      files.push(fullPath);
+    }
+  }
+  return files.sort();
+}
+
+/**
+ * Whether a project-relative source lies in the analyzed scope ("" = whole project)
+ */
+function isWithin(source: string, scope: string): boolean {
+  return scope === "" || source === scope || source.startsWith(`${scope}/`);
+}
+
+/**
+ * Merge per-file analyses into a single SpecAnalysis
+ */
+export function mergeAnalyses(analyses: SpecAnalysis[], source: string): SpecAnalysis {
+  const merged = emptyAnalysis(source, domainOf(source));
+  if (analyses.length === 1) {
+    merged.meta = { ...analyses[0].meta };
+  }
+
+  for (const analysis of analyses) {
+    merged.apis.push(...analysis.apis);
+    merged.models.push(...analysis.models);
+    merged.workflows.push(...analysis.workflows);
+    merged.constraints.push(...analysis.constraints);
+    merged.checklists.push(...analysis.checklists);
+    for (const category of ["frameworks", "databases", "services"] as const) {
+      applyRecord(merged, { kind: "techStack", category, values: analysis.techStack[category] });
+    }
+  }
+
+  return merged;
+}
+
+/**
+ * Deterministic pre-pass over Markdown specs (API headings, model tables,
+ * constraints, workflows, checklists, tech stack)
+ *
+ * Results are cached per file in .claude/ by content hash. Files whose
+ * size and mtime are unchanged are not even read; the rest are hashed and
+ * only re-parsed when their content changed. Entries for files under
+ * specPath that no longer exist are dropped from the cache.
+ */
+export function analyzeSpecs(
+  specPath: string,
+  options: AnalyzeOptions = {}
+): AnalyzeResult {
+  const projectRoot = resolve(options.projectRoot ?? ".");
+  const useCache = options.cache !== false;
+  const cachePath = join(projectRoot, ".claude", ANALYSIS_CACHE_FILE);
+  const trace: Tracer<AnalyzePhase> | undefined = traceEnabled(options.trace)
+    ? new Tracer(ANALYZE_PHASES, "analyze", specPath)
+    : undefined;
+  const cache = useCache
+    ? span(trace, "cacheRead", () => readAnalysisCache(cachePath, trace))
+    : undefined;
+
+  const analyses: SpecAnalysis[] = [];
+  const parsed: string[] = [];
+  const cached: string[] = [];
+
+  const scope = toPosix(relative(projectRoot, resolve(projectRoot, specPath)));
+  const files = span(trace, "scan", () =>
+    findMarkdownFiles(resolve(projectRoot, specPath), trace)
+  );
+
+  const dirty = span(trace, "parse", () => {
+    let dirty = false;
+    for (const file of files) {
+      const source = toPosix(relative(projectRoot, file));
+      const stats = tryStat(file)!;
+      const entry = cache?.files[source];
+      trace?.count("stat");
+
+      if (entry && entry.size === stats.size && entry.mtimeMs === stats.mtimeMs) {
+        analyses.push(entry.analysis);
+        cached.push(source);
+        continue;
+      }
+
+      const content = readFileSync(file);
+      const hash = hashContent(content);
+      if (trace) {
+        trace.count("read");
+        trace.bytes += content.length;
+      }
+
+      if (entry && entry.hash === hash) {
+        // 内容は同じ（touch されただけ）
+        entry.size = stats.size;
+        entry.mtimeMs = stats.mtimeMs;
+        analyses.push(entry.analysis);
+        cached.push(source);
+      } else {
+        const analysis = parseMarkdownSpec(content.toString("utf-8"), source, domainOf(source));
+        if (cache) {
+          cache.files[source] = { hash, size: stats.size, mtimeMs: stats.mtimeMs, analysis };
+        }
+        analyses.push(analysis);
+        parsed.push(source);
+      }
+      dirty = true;
+    }
+
+    // 削除・リネームされた仕様書のエントリを破棄
+    if (cache) {
+      const seen = new Set([...parsed, ...cached]);
+      for (const source of Object.keys(cache.files)) {
+        if (isWithin(source, scope) && !seen.has(source)) {
+          delete cache.files[source];
+          dirty = true;
+        }
+      }
+    }
+    return dirty;
+  });
+
+  if (cache && dirty) {
+    span(trace, "cacheWrite", () => writeAnalysisCache(cachePath, cache, trace));
+  }
+
+  return {
+    analyses,
+    merged: mergeAnalyses(analyses, scope || "."),
+    parsed,
+    cached,
+    ...(trace && {
+      metrics: { ...trace.metrics(), filesParsed: parsed.length, bytesRead: trace.bytes },
+    }),
+  };
+}
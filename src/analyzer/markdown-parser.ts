@@ -0,0 +1,438 @@
+import { basename, extname } from "path";
+import type {
+  ApiDefinition,
+  ChecklistDefinition,
+  ConstraintType,
+  FieldDefinition,
+  ModelDefinition,
+  SpecAnalysis,
+  SpecRecord,
+  TechStack,
+  WorkflowDefinition,
+} from "./types.js";
+
+const HEADING = /^(#{1,6})\s+(.*)$/;
+// 大文字の HTTP メソッド + パス（"/users"、"{id}"、":id"）。"Get started" などは見出しのまま
+const API_HEADING = /^(GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS)\s+((?:\/|\{[^}\s]+\}|:\w)\S*)/;
+const BOLD_LABEL = /^\*\*(.+?)\*\*\s*:?\s*$/;
+const FENCE = /^\s*(```|~~~)/;
+const TABLE_ROW = /^\s*\|(.*)\|\s*$/;
+const TABLE_DIVIDER = /^\s*\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?\s*$/;
+const CHECKBOX = /^\s*[-*+]\s+\[([ xX])\]\s+(.*)$/;
+const LIST_ITEM = /^\s*(?:[-*+]|\d+[.)])\s+(.*)$/;
+const VERSION = /^\**(?:version|バージョン)\**\s*[:：]\s*\**\s*(\S+)/i;
+
+const CONSTRAINT_SECTION = /constraint|rule|制約|ルール|validation|バリデーション|security|セキュリティ/i;
+const WORKFLOW_SECTION = /workflow|flow|use ?case|ワークフロー|フロー|ユースケース/i;
+const TECH_STACK_SECTION = /tech(nology)?\s*stack|技術スタック/i;
+
+const NAME_COLUMN = /^(field|name|parameter|param|property|column|フィールド|パラメータ|名前|項目)$/i;
+const TYPE_COLUMN = /^(type|型)$/i;
+const REQUIRED_COLUMN = /^(required|必須)$/i;
+const DESCRIPTION_COLUMN = /^(description|説明)$/i;
+const TRUTHY = /^(yes|y|true|required|✓|✔|○|◯|はい|必須)$/i;
+
+interface Heading {
+  level: number;
+  text: string;
+}
+
+interface TableColumns {
+  name: number;
+  type: number;
+  required: number;
+  description: number;
+}
+
+type ApiSection = "parameters" | "response" | "other" | null;
+
+function stripInline(text: string): string {
+  if (text.includes("`")) text = text.replace(/`/g, "");
+  if (text.includes("**")) text = text.replace(/\*\*/g, "");
+  return text.trim();
+}
+
+function headingText(text: string): string {
+  // 閉じの # を除去（"## Title ##"）
+  return stripInline(text.endsWith("#") ? text.replace(/\s+#+\s*$/, "") : text);
+}
+
+function splitRow(line: string): string[] {
+  return TABLE_ROW.exec(line)![1].split("|").map((cell) => stripInline(cell));
+}
+
+function findColumns(header: string[]): TableColumns | undefined {
+  const find = (pattern: RegExp) => header.findIndex((cell) => pattern.test(cell));
+  const columns = {
+    name: find(NAME_COLUMN),
+    type: find(TYPE_COLUMN),
+    required: find(REQUIRED_COLUMN),
+    description: find(DESCRIPTION_COLUMN),
+  };
+  return columns.name >= 0 && columns.type >= 0 ? columns : undefined;
+}
+
+function toField(cells: string[], columns: TableColumns): FieldDefinition {
+  return {
+    name: cells[columns.name] ?? "",
+    type: cells[columns.type] ?? "",
+    required: columns.required >= 0 && TRUTHY.test(cells[columns.required] ?? ""),
+    description: columns.description >= 0 ? cells[columns.description] ?? "" : "",
+  };
+}
+
+function constraintType(heading: string): ConstraintType {
+  if (/security|セキュリティ/i.test(heading)) return "security";
+  if (/validation|バリデーション/i.test(heading)) return "validation";
+  return "business_rule";
+}
+
+function techStackCategory(label: string): keyof TechStack {
+  if (/database|db|storage|データベース/i.test(label)) return "databases";
+  if (/framework|language|runtime|library|フレームワーク|言語/i.test(label)) return "frameworks";
+  return "services";
+}
+
+/**
+ * Line-driven Markdown spec parser
+ *
+ * Feed lines one at a time; each API, model, workflow, constraint and
+ * checklist is passed to `onRecord` as soon as it is complete. Only the
+ * construct currently being read is kept in memory.
+ */
+export class MarkdownSpecParser {
+  private headings: Heading[] = [];
+  private inFence = false;
+  private titleSeen = false;
+  private versionSeen = false;
+
+  private api: ApiDefinition | undefined;
+  private apiSection: ApiSection = null;
+  private model: ModelDefinition | undefined;
+  private workflow: WorkflowDefinition | undefined;
+  private checklist: ChecklistDefinition | undefined;
+  private description = "";
+  private awaitingDescription = false;
+
+  private tableColumns: TableColumns | undefined;
+  private tableHeader: string[] | undefined;
+
+  constructor(private readonly onRecord: (record: SpecRecord) => void) {}
+
+  feed(line: string): void {
+    // 正規表現の前に安価な文字チェックで振り分ける（大きな仕様書向け）
+    if ((line.includes("```") || line.includes("~~~")) && FENCE.test(line)) {
+      this.inFence = !this.inFence;
+      return;
+    }
+    if (this.inFence) {
+      return;
+    }
+
+    if (line.charCodeAt(0) === 35 /* # */) {
+      const heading = HEADING.exec(line);
+      if (heading) {
+        this.openHeading(heading[1].length, headingText(heading[2]));
+        return;
+      }
+    }
+
+    if (line.includes("|") && TABLE_ROW.test(line)) {
+      this.tableRow(line);
+      return;
+    }
+    this.tableHeader = undefined;
+    this.tableColumns = undefined;
+
+    const trimmed = line.trim();
+    if (!trimmed) {
+      return;
+    }
+
+    // バージョンは冒頭（最初の節より前）のみ探す
+    if (!this.versionSeen && this.headings.length <= 1) {
+      const version = VERSION.exec(trimmed);
+      if (version) {
+        this.versionSeen = true;
+        this.onRecord({ kind: "version", version: stripInline(version[1]) });
+        return;
+      }
+    }
+
+    const label = BOLD_LABEL.exec(trimmed);
+    if (label) {
+      this.awaitingDescription = false;
+      if (this.api) {
+        const text = label[1];
+        this.apiSection = /param|パラメータ/i.test(text)
+          ? "parameters"
+          : /response|レスポンス/i.test(text)
+            ? "response"
+            : "other";
+      }
+      return;
+    }
+
+    const checkbox = CHECKBOX.exec(line);
+    if (checkbox) {
+      this.awaitingDescription = false;
+      this.checklist ??= { name: this.currentHeading(), items: [] };
+      this.checklist.items.push({
+        text: stripInline(checkbox[2]),
+        checked: checkbox[1] !== " ",
+      });
+      return;
+    }
+
+    const item = LIST_ITEM.exec(line);
+    if (item) {
+      this.awaitingDescription = false;
+      this.listItem(stripInline(item[1]));
+      return;
+    }
+
+    // 見出し直後の最初の段落を説明として扱う
+    if (this.awaitingDescription) {
+      this.awaitingDescription = false;
+      this.description = stripInline(trimmed);
+      if (this.api) this.api.description = this.description;
+      if (this.model) this.model.description = this.description;
+    }
+  }
+
+  end(): void {
+    this.flush();
+    this.headings = [];
+  }
+
+  private currentHeading(): string {
+    return this.headings.length > 0 ? this.headings[this.headings.length - 1].text : "";
+  }
+
+  /**
+   * The deepest enclosing heading that matches a section pattern decides
+   * what plain list items mean (constraint, workflow step, tech stack)
+   */
+  private sectionKind(): { kind: "constraint" | "workflow" | "techStack"; heading: string } | undefined {
+    for (let i = this.headings.length - 1; i >= 0; i--) {
+      const { text } = this.headings[i];
+      if (TECH_STACK_SECTION.test(text)) return { kind: "techStack", heading: text };
+      if (CONSTRAINT_SECTION.test(text)) return { kind: "constraint", heading: text };
+      if (WORKFLOW_SECTION.test(text)) return { kind: "workflow", heading: text };
+    }
+    return undefined;
+  }
+
+  private openHeading(level: number, text: string): void {
+    this.flush();
+
+    while (this.headings.length > 0 && this.headings[this.headings.length - 1].level >= level) {
+      this.headings.pop();
+    }
+    this.headings.push({ level, text });
+
+    this.awaitingDescription = true;
+
+    if (level === 1 && !this.titleSeen) {
+      this.titleSeen = true;
+      this.onRecord({ kind: "title", title: text });
+      return;
+    }
+
+    const api = API_HEADING.exec(text);
+    if (api) {
+      this.api = {
+        name: `${api[1]} ${api[2]}`,
+        method: api[1],
+        endpoint: api[2],
+        description: "",
+        parameters: [],
+      };
+      return;
+    }
+
+    this.model = {
+      name: text.replace(/\s*(model|モデル)$/i, ""),
+      description: "",
+      fields: [],
+    };
+  }
+
+  private tableRow(line: string): void {
+    this.awaitingDescription = false;
+
+    if (TABLE_DIVIDER.test(line)) {
+      return;
+    }
+    if (!this.tableHeader) {
+      this.tableHeader = splitRow(line);
+      this.tableColumns = findColumns(this.tableHeader);
+      return;
+    }
+    if (!this.tableColumns) {
+      return;
+    }
+
+    const field = toField(splitRow(line), this.tableColumns);
+    if (this.api) {
+      if (this.apiSection !== "response") {
+        this.api.parameters.push(field);
+      }
+    } else if (this.model) {
+      this.model.fields.push(field);
+    }
+  }
+
+  private listItem(text: string): void {
+    if (this.api) {
+      this.apiListItem(text);
+      return;
+    }
+
+    const section = this.sectionKind();
+    if (!section) {
+      return;
+    }
+
+    if (section.kind === "constraint") {
+      this.onRecord({
+        kind: "constraint",
+        constraint: { description: text, type: constraintType(section.heading) },
+      });
+    } else if (section.kind === "workflow") {
+      this.workflow ??= { name: this.currentHeading(), description: this.description, steps: [] };
+      this.workflow.steps.push(text);
+    } else {
+      const match = /^([^:：]+)[:：]\s*(.+)$/.exec(text);
+      const values = (match ? match[2] : text)
+        .split(/\s*(?:\+|,|、|\/)\s*/)
+        .map((value) => value.trim())
+        .filter(Boolean);
+      this.onRecord({
+        kind: "techStack",
+        category: techStackCategory(match ? match[1] : text),
+        values,
+      });
+    }
+  }
+
+  private apiListItem(text: string): void {
+    const api = this.api!;
+
+    if (this.apiSection === "response") {
+      const response = /^(\d{3}[^:：]*)[:：]?\s*(.*)$/.exec(text);
+      if (response && !api.response) {
+        api.response = { type: response[1].trim(), description: response[2].trim() };
+      }
+      return;
+    }
+
+    // - email (string, required): Email address
+    const param = /^([\w.[\]-]+)\s*\(([^)]*)\)\s*[:：-]?\s*(.*)$/.exec(text);
+    if (param && this.apiSection === "parameters") {
+      const attrs = param[2].split(",").map((attr) => attr.trim());
+      api.parameters.push({
+        name: param[1],
+        type: attrs[0] ?? "",
+        required: attrs.some((attr) => /^required$|必須/i.test(attr)),
+        description: param[3],
+      });
+    }
+  }
+
+  private flush(): void {
+    if (this.api) {
+      this.onRecord({ kind: "api", api: this.api });
+    }
+    if (this.model && this.model.fields.length > 0) {
+      this.onRecord({ kind: "model", model: this.model });
+    }
+    if (this.workflow) {
+      this.onRecord({ kind: "workflow", workflow: this.workflow });
+    }
+    if (this.checklist) {
+      this.onRecord({ kind: "checklist", checklist: this.checklist });
+    }
+
+    this.api = undefined;
+    this.apiSection = null;
+    this.model = undefined;
+    this.workflow = undefined;
+    this.checklist = undefined;
+    this.description = "";
+    this.awaitingDescription = false;
+    this.tableHeader = undefined;
+    this.tableColumns = undefined;
+  }
+}
+
+export function domainOf(source: string): string {
+  return basename(source, extname(source));
+}
+
+export function emptyAnalysis(source: string, domain: string): SpecAnalysis {
+  return {
+    meta: { title: domain, domain, source },
+    apis: [],
+    models: [],
+    workflows: [],
+    constraints: [],
+    checklists: [],
+    techStack: { frameworks: [], databases: [], services: [] },
+  };
+}
+
+/**
+ * Fold a parser record into a SpecAnalysis
+ */
+export function applyRecord(analysis: SpecAnalysis, record: SpecRecord): void {
+  switch (record.kind) {
+    case "title":
+      analysis.meta.title = record.title;
+      break;
+    case "version":
+      analysis.meta.version = record.version;
+      break;
+    case "api":
+      analysis.apis.push(record.api);
+      break;
+    case "model":
+      analysis.models.push(record.model);
+      break;
+    case "workflow":
+      analysis.workflows.push(record.workflow);
+      break;
+    case "constraint":
+      analysis.constraints.push(record.constraint);
+      break;
+    case "checklist":
+      analysis.checklists.push(record.checklist);
+      break;
+    case "techStack": {
+      const list = analysis.techStack[record.category];
+      for (const value of record.values) {
+        if (!list.includes(value)) list.push(value);
+      }
+      break;
+    }
+  }
+}
+
+/**
+ * Parse a whole Markdown document into a SpecAnalysis
+ */
+export function parseMarkdownSpec(
+  content: string,
+  source: string,
+  domain: string
+): SpecAnalysis {
+  const analysis = emptyAnalysis(source, domain);
+  const parser = new MarkdownSpecParser((record) => applyRecord(analysis, record));
+
+  for (const line of content.split(/\r?\n/)) {
+    parser.feed(line);
+  }
+  parser.end();
+
+  return analysis;
+}
@@ -0,0 +1,199 @@
+import { createReadStream } from "fs";
+import { Worker, type WorkerOptions } from "worker_threads";
+import { cpus } from "os";
+import {
+  applyRecord,
+  domainOf,
+  emptyAnalysis,
+  MarkdownSpecParser,
+} from "./markdown-parser.js";
+import type { SpecAnalysis, SpecRecord } from "./types.js";
+
+// ビルド後は tsup が出力する dist/spec-worker.js、ソースから実行する場合
+// （vitest / tsx）は worker.ts を tsx 経由で読み込む（tsx は devDependency）
+const FROM_SOURCE = import.meta.url.endsWith(".ts");
+const WORKER_URL = new URL(FROM_SOURCE ? "./worker.ts" : "./spec-worker.js", import.meta.url);
+const WORKER_OPTIONS: WorkerOptions = FROM_SOURCE
+  ? { execArgv: [...process.execArgv, "--import", "tsx"] }
+  : {};
+
+export interface SourcedRecord {
+  /** File path as passed by the caller */
+  source: string;
+  record: SpecRecord;
+}
+
+export interface StreamOptions {
+  /** Number of worker threads (default: CPU count, at most one per file) */
+  workers?: number;
+  /** Records per message from a worker; each worker waits for the batch to be consumed */
+  batchSize?: number;
+}
+
+/** Messages exchanged with the worker (src/analyzer/worker.ts) */
+export type WorkerRequest =
+  | { type: "parse"; file: string; batchSize: number }
+  | { type: "ack" };
+
+export type WorkerResponse =
+  | { type: "batch"; file: string; records: SpecRecord[] }
+  | { type: "done"; file: string }
+  | { type: "error"; file: string; message: string };
+
+const ACK: WorkerRequest = { type: "ack" };
+
+/**
+ * Read a text file as batches of lines (one batch per stream chunk)
+ * Memory is bounded by the stream's highWaterMark.
+ */
+async function* readLineBatches(path: string): AsyncGenerator<string[]> {
+  let rest = "";
+
+  for await (const chunk of createReadStream(path, { encoding: "utf-8" })) {
+    const lines = (rest + chunk).split(/\r?\n/);
+    rest = lines.pop()!;
+    yield lines;
+  }
+
+  if (rest) {
+    yield [rest];
+  }
+}
+
+/**
+ * Read a text file line by line with bounded memory
+ */
+export async function* readLines(path: string): AsyncGenerator<string> {
+  for await (const lines of readLineBatches(path)) {
+    yield* lines;
+  }
+}
+
+/**
+ * Stream parser records from a Markdown spec as they are completed
+ * Memory stays flat regardless of file size.
+ */
+export async function* streamSpecRecords(path: string): AsyncGenerator<SpecRecord> {
+  const pending: SpecRecord[] = [];
+  const parser = new MarkdownSpecParser((record) => pending.push(record));
+
+  for await (const lines of readLineBatches(path)) {
+    for (const line of lines) {
+      parser.feed(line);
+    }
+    if (pending.length > 0) {
+      yield* pending;
+      pending.length = 0;
+    }
+  }
+
+  parser.end();
+  yield* pending;
+}
+
+/**
+ * Stream records from many spec files, parsing up to `workers` files at
+ * once on worker threads. Records of one file arrive in order; records of
+ * different files are interleaved.
+ */
+export async function* streamSpecRecordsParallel(
+  files: string[],
+  options: StreamOptions = {}
+): AsyncGenerator<SourcedRecord> {
+  const batchSize = Math.max(1, options.batchSize ?? 256);
+  const size = Math.max(
+    1,
+    Math.min(options.workers ?? cpus().length, files.length)
+  );
+  if (files.length === 0) {
+    return;
+  }
+
+  const events: { worker: Worker; message: WorkerResponse }[] = [];
+  let wake: (() => void) | undefined;
+  let failure: Error | undefined;
+
+  const workers = Array.from({ length: size }, () => {
+    const worker = new Worker(WORKER_URL, WORKER_OPTIONS);
+    worker.on("message", (message: WorkerResponse) => {
+      events.push({ worker, message });
+      wake?.();
+    });
+    worker.on("error", (error) => {
+      failure ??= error;
+      wake?.();
+    });
+    worker.on("exit", (code) => {
+      failure ??= new Error(`Spec parser worker exited with code ${code}`);
+      wake?.();
+    });
+    return worker;
+  });
+
+  let next = 0;
+  let active = 0;
+  const assign = (worker: Worker) => {
+    if (next < files.length) {
+      const request: WorkerRequest = { type: "parse", file: files[next++], batchSize };
+      worker.postMessage(request);
+      active++;
+    }
+  };
+
+  try {
+    workers.forEach(assign);
+
+    while (active > 0) {
+      if (failure) {
+        throw failure;
+      }
+      const event = events.shift();
+      if (!event) {
+        await new Promise<void>((resolve) => (wake = resolve));
+        wake = undefined;
+        continue;
+      }
+
+      const { worker, message } = event;
+      switch (message.type) {
+        case "batch":
+          for (const record of message.records) {
+            yield { source: message.file, record };
+          }
+          // 消費し終えてから次のバッチを要求（バックプレッシャー）
+          worker.postMessage(ACK);
+          break;
+        case "done":
+          active--;
+          assign(worker);
+          break;
+        case "error":
+          throw new Error(`${message.file}: ${message.message}`);
+      }
+    }
+  } finally {
+    await Promise.all(workers.map((worker) => worker.terminate()));
+  }
+}
+
+/**
+ * Parse spec files on worker threads and fold the records into one
+ * SpecAnalysis per file (returned in the order of `files`)
+ * A path listed more than once is parsed once.
+ */
+export async function analyzeSpecFiles(
+  files: string[],
+  options: StreamOptions = {}
+): Promise<SpecAnalysis[]> {
+  // レコードはパスで振り分けるため、同じパスを 2 回解析しない
+  const unique = [...new Set(files)];
+  const analyses = new Map(
+    unique.map((file) => [file, emptyAnalysis(file, domainOf(file))])
+  );
+
+  for await (const { source, record } of streamSpecRecordsParallel(unique, options)) {
+    applyRecord(analyses.get(source)!, record);
+  }
+
+  return files.map((file) => analyses.get(file)!);
+}
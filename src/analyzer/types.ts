@@ -0,0 +1,85 @@
+/**
+ * SpecAnalysis 型定義（docs/spec2impl-specification.md の Spec Analyzer 出力）
+ */
+
+export interface FieldDefinition {
+  name: string;
+  type: string;
+  required: boolean;
+  description: string;
+}
+
+export interface ApiDefinition {
+  name: string;
+  method?: string;
+  endpoint?: string;
+  description: string;
+  parameters: FieldDefinition[];
+  response?: {
+    type: string;
+    description: string;
+  };
+}
+
+export interface ModelDefinition {
+  name: string;
+  description: string;
+  fields: FieldDefinition[];
+}
+
+export interface WorkflowDefinition {
+  name: string;
+  description: string;
+  steps: string[];
+}
+
+export type ConstraintType = "validation" | "business_rule" | "security";
+
+export interface ConstraintDefinition {
+  description: string;
+  type: ConstraintType;
+}
+
+export interface ChecklistItem {
+  text: string;
+  checked: boolean;
+}
+
+export interface ChecklistDefinition {
+  name: string;
+  items: ChecklistItem[];
+}
+
+export interface TechStack {
+  frameworks: string[];
+  databases: string[];
+  services: string[];
+}
+
+export interface SpecAnalysis {
+  meta: {
+    title: string;
+    domain: string;
+    version?: string;
+    source: string; // ファイルパス
+  };
+  apis: ApiDefinition[];
+  models: ModelDefinition[];
+  workflows: WorkflowDefinition[];
+  constraints: ConstraintDefinition[];
+  checklists: ChecklistDefinition[];
+  techStack: TechStack;
+}
+
+/**
+ * Records emitted by the parser as each construct is completed
+ */
+export type SpecRecord =
+  | { kind: "title"; title: string }
+  | { kind: "version"; version: string }
+  | { kind: "api"; api: ApiDefinition }
+  | { kind: "model"; model: ModelDefinition }
+  | { kind: "workflow"; workflow: WorkflowDefinition }
+  | { kind: "constraint"; constraint: ConstraintDefinition }
+  | { kind: "checklist"; checklist: ChecklistDefinition }
+  | { kind: "techStack"; category: keyof TechStack; values: string[] };
@@ -0,0 +1,58 @@
+/**
+ * Worker thread entry for streamSpecRecordsParallel (built as dist/spec-worker.js)
+ */
+import { parentPort } from "worker_threads";
+import {
+  streamSpecRecords,
+  type WorkerRequest,
+  type WorkerResponse,
+} from "./stream.js";
+import type { SpecRecord } from "./types.js";
+
+const port = parentPort!;
+let ack: (() => void) | undefined;
+
+function post(message: WorkerResponse): void {
+  port.postMessage(message);
+}
+
+// バッチを送り、メインスレッドが消費するまで待つ
+function send(file: string, records: SpecRecord[]): Promise<void> {
+  return new Promise((resolve) => {
+    ack = resolve;
+    post({ type: "batch", file, records });
+  });
+}
+
+async function parse(file: string, batchSize: number): Promise<void> {
+  try {
+    let batch: SpecRecord[] = [];
+    for await (const record of streamSpecRecords(file)) {
+      batch.push(record);
+      if (batch.length >= batchSize) {
+        await send(file, batch);
+        batch = [];
+      }
+    }
+    if (batch.length > 0) {
+      await send(file, batch);
+    }
+    post({ type: "done", file });
+  } catch (error) {
+    post({
+      type: "error",
+      file,
+      message: error instanceof Error ? error.message : String(error),
+    });
+  }
+}
+
+port.on("message", (request: WorkerRequest) => {
+  if (request.type === "ack") {
+    const resolve = ack;
+    ack = undefined;
+    resolve?.();
+  } else {
+    void parse(request.file, request.batchSize);
+  }
+});
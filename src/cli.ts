@@ -1,255 +1,410 @@
 #!/usr/bin/env node
 
-import { program } from "commander";
-import chalk from "chalk";
-import ora from "ora";
-import { fileURLToPath } from "url";
-import { dirname, join, resolve } from "path";
+import { relative, resolve } from "path";
+import { existsSync, readFileSync, writeFileSync } from "fs";
 import {
-  existsSync,
-  mkdirSync,
-  copyFileSync,
-  readdirSync,
-  statSync,
-} from "fs";
-
-const __filename = fileURLToPath(import.meta.url);
-const __dirname = dirname(__filename);
-
-// テンプレートディレクトリのパス（パッケージルートからの相対パス）
-const TEMPLATES_DIR = join(__dirname, "..", "templates");
-
-// spec2impl が管理するパス（常に上書き対象）
-const SPEC2IMPL_PATHS = [
-  "commands/spec2impl.md",
-  "agents/spec2impl/",
-  "skills/skill-creator/",
-];
-
-interface InstallOptions {
-  force?: boolean;
-  dryRun?: boolean;
+  createInstallPlansWithMetrics,
+  installAsync,
+  installMany,
+  type InstallManyOptions,
+} from "./installer.js";
+import { planToJSON, type InstallPlan } from "./plan.js";
+import { expandTargets } from "./targets.js";
+import { combineInstallMetrics, toChromeTrace, type InstallMetrics } from "./trace.js";
+import { loadUi, type Colors } from "./ui.js";
+
+const CLI_VERSION = "0.2.1";
+
+interface InstallOptions extends Omit<InstallManyOptions, "trace"> {
   detectStack?: boolean;
-}
-
-interface FileInfo {
-  relativePath: string;
-  exists: boolean;
-  isSpec2implManaged: boolean;
+  json?: boolean;
+  /** --trace (true) or --trace <file> */
+  trace?: boolean | string;
 }
 
 /**
- * ファイルが spec2impl 管理下かどうかを判定
+ * CLI のトレース指定をライブラリのオプションに変換
+ * 指定がなければ SPEC2IMPL_TRACE に従う
  */
-function isSpec2implManagedPath(relativePath: string): boolean {
-  return SPEC2IMPL_PATHS.some(
-    (managedPath) =>
-      relativePath === managedPath ||
-      relativePath.startsWith(managedPath)
-  );
+function libraryOptions(options: InstallOptions): InstallManyOptions {
+  return { ...options, trace: options.trace ? true : undefined };
 }
 
-function getFilesToCopy(
-  templateDir: string,
-  targetDir: string,
-  base = ""
-): FileInfo[] {
-  const files: FileInfo[] = [];
-  const entries = readdirSync(templateDir);
-
-  for (const entry of entries) {
-    const templatePath = join(templateDir, entry);
-    const relativePath = base ? join(base, entry) : entry;
-    const targetPath = join(targetDir, relativePath);
-
-    if (statSync(templatePath).isDirectory()) {
-      files.push(...getFilesToCopy(templatePath, targetDir, relativePath));
-    } else {
-      files.push({
-        relativePath,
-        exists: existsSync(targetPath),
-        isSpec2implManaged: isSpec2implManagedPath(relativePath),
-      });
-    }
+/**
+ * Chrome trace JSON の出力先（--trace <file> または SPEC2IMPL_TRACE=<file>.json）
+ */
+function traceFile(options: InstallOptions): string | undefined {
+  if (typeof options.trace === "string") {
+    return options.trace;
   }
-
-  return files;
+  const env = process.env.SPEC2IMPL_TRACE;
+  return env?.endsWith(".json") ? env : undefined;
 }
 
-function copyFilesRecursively(
-  srcDir: string,
-  destDir: string,
-  force: boolean
-): { copied: string[]; skipped: string[]; updated: string[] } {
-  const copied: string[] = [];
-  const skipped: string[] = [];
-  const updated: string[] = [];
-
-  function processDir(src: string, dest: string, relativePath = "") {
-    if (!existsSync(dest)) {
-      mkdirSync(dest, { recursive: true });
-    }
-
-    const entries = readdirSync(src);
-
-    for (const entry of entries) {
-      const srcPath = join(src, entry);
-      const destPath = join(dest, entry);
-      const relPath = relativePath ? join(relativePath, entry) : entry;
-
-      if (statSync(srcPath).isDirectory()) {
-        processDir(srcPath, destPath, relPath);
-      } else {
-        const isManaged = isSpec2implManagedPath(relPath);
-        const fileExists = existsSync(destPath);
-
-        // spec2impl 管理ファイルは常に上書き、それ以外は force が必要
-        if (fileExists && !isManaged && !force) {
-          skipped.push(relPath);
-        } else {
-          // 親ディレクトリを作成
-          const parentDir = dirname(destPath);
-          if (!existsSync(parentDir)) {
-            mkdirSync(parentDir, { recursive: true });
-          }
-          copyFileSync(srcPath, destPath);
-
-          if (fileExists && isManaged) {
-            updated.push(relPath);
-          } else {
-            copied.push(relPath);
-          }
-        }
-      }
-    }
+function writeTrace(file: string | undefined, metrics: InstallMetrics[]) {
+  if (!file || metrics.length === 0) {
+    return;
   }
-
-  processDir(srcDir, destDir);
-  return { copied, skipped, updated };
+  writeFileSync(file, JSON.stringify(toChromeTrace(metrics)) + "\n");
 }
 
-function install(targetDir: string, options: InstallOptions = {}) {
-  const spinner = ora("Installing spec2impl...").start();
+const ms = (value: number) => `${value.toFixed(1)} ms`;
+
+// トレース結果は stdout（--json など）を汚さないよう stderr に出力
+function printMetrics(c: Colors, metrics: InstallMetrics) {
+  const lines = [
+    c.bold(`Trace: ${ms(metrics.totalMs)}`),
+    ...Object.entries(metrics.phases).map(([phase, time]) => `  ${phase.padEnd(14)}${ms(time)}`),
+    `  ${metrics.filesCopied} files, ${(metrics.bytesCopied / 1024).toFixed(1)} KB copied` +
+      ` (${Math.round(metrics.filesPerSecond)} files/s)`,
+    c.dim(
+      "  syscalls: " +
+        Object.entries(metrics.syscalls)
+          .map(([kind, count]) => `${kind} ${count}`)
+          .join(", ")
+    ),
+  ];
+  console.error(lines.join("\n"));
+}
 
-  const projectRoot = resolve(targetDir);
-  const claudeDir = join(projectRoot, ".claude");
-  const templateClaudeDir = join(TEMPLATES_DIR, ".claude");
-
-  // テンプレートディレクトリの存在確認
-  if (!existsSync(TEMPLATES_DIR)) {
-    spinner.fail(
-      chalk.red("Template directory not found. Package may be corrupted.")
-    );
-    process.exit(1);
-  }
-
-  // ドライランモード
-  if (options.dryRun) {
-    spinner.info(chalk.cyan("Dry run mode - no files will be created"));
-    console.log("");
-    console.log(chalk.bold("Files to be installed:"));
-
-    const files = getFilesToCopy(templateClaudeDir, claudeDir);
-    for (const file of files) {
-      if (file.exists && file.isSpec2implManaged) {
-        console.log(chalk.cyan(`  .claude/${file.relativePath} (update)`));
-      } else if (file.exists && !options.force) {
-        console.log(chalk.yellow(`  .claude/${file.relativePath} (skip - exists)`));
-      } else if (file.exists && options.force) {
-        console.log(chalk.cyan(`  .claude/${file.relativePath} (overwrite)`));
-      } else {
-        console.log(chalk.green(`  .claude/${file.relativePath}`));
-      }
-    }
-    return;
-  }
+async function install(targetDir: string, options: InstallOptions = {}) {
+  const { colors: c, spinner: createSpinner } = await loadUi();
+  const spinner = createSpinner("Installing spec2impl...").start();
 
   try {
-    // ファイル単位でコピー
-    const { copied, skipped, updated } = copyFilesRecursively(
-      templateClaudeDir,
-      claudeDir,
-      options.force || false
-    );
+    // 前回から変更のあったファイルのみコピー
+    const result = await installAsync(targetDir, libraryOptions(options));
+    if (result.metrics) {
+      writeTrace(traceFile(options), [result.metrics]);
+    }
+    if (!result.success) {
+      spinner.fail(c.red(result.error ?? "Installation failed"));
+      process.exit(1);
+    }
+    const { copied, skipped, updated, unchanged } = result;
 
-    spinner.succeed(chalk.green("spec2impl installed successfully!"));
+    spinner.succeed(c.green("spec2impl installed successfully!"));
 
     console.log("");
 
     if (updated.length > 0) {
-      console.log(chalk.bold("Updated files:"));
+      console.log(c.bold("Updated files:"));
       for (const file of updated) {
-        console.log(chalk.cyan(`  .claude/${file}`));
+        console.log(c.cyan(`  ${file}`));
       }
       console.log("");
     }
 
     if (copied.length > 0) {
-      console.log(chalk.bold("Installed files:"));
+      console.log(c.bold("Installed files:"));
       for (const file of copied) {
-        console.log(chalk.dim(`  .claude/${file}`));
+        console.log(c.dim(`  ${file}`));
       }
     }
 
     if (skipped.length > 0) {
       console.log("");
-      console.log(chalk.yellow("Skipped (user files):"));
+      console.log(c.yellow("Skipped (user files):"));
       for (const file of skipped) {
-        console.log(chalk.dim(`  .claude/${file}`));
+        console.log(c.dim(`  ${file}`));
       }
-      console.log(chalk.dim("\n  Use --force to overwrite user files."));
+      console.log(c.dim("\n  Use --force to overwrite user files."));
+    }
+
+    if (unchanged.length > 0) {
+      console.log("");
+      console.log(c.dim(`Unchanged: ${unchanged.length} files already up to date`));
     }
 
     console.log("");
-    console.log(chalk.bold("Next steps:"));
+    console.log(c.bold("Next steps:"));
     console.log("");
-    console.log(chalk.cyan("  1. Open Claude Code in this project"));
-    console.log(chalk.cyan("  2. Run the command:"));
+    console.log(c.cyan("  1. Open Claude Code in this project"));
+    console.log(c.cyan("  2. Run the command:"));
     console.log("");
-    console.log(chalk.bold.white("     /spec2impl docs/"));
-    console.log(chalk.dim("     # From specification documents"));
+    console.log(c.boldWhite("     /spec2impl docs/"));
+    console.log(c.dim("     # From specification documents"));
     console.log("");
-    console.log(chalk.bold.white("     /spec2impl --detect-stack"));
-    console.log(chalk.dim("     # From project files (package.json, etc.)"));
+    console.log(c.boldWhite("     /spec2impl --detect-stack"));
+    console.log(c.dim("     # From project files (package.json, etc.)"));
     console.log("");
-    console.log(chalk.bold.white("     /spec2impl docs/ --detect-stack"));
-    console.log(chalk.dim("     # Both: spec + project detection (merged)"));
+    console.log(c.boldWhite("     /spec2impl docs/ --detect-stack"));
+    console.log(c.dim("     # Both: spec + project detection (merged)"));
     console.log("");
+
+    if (result.metrics) {
+      printMetrics(c, result.metrics);
+    }
   } catch (error) {
-    spinner.fail(chalk.red("Installation failed"));
+    spinner.fail(c.red("Installation failed"));
     console.error(error);
     process.exit(1);
   }
 }
 
-program
-  .name("spec2impl")
-  .description("Generate Claude Code implementation environment from specification documents")
-  .version("0.2.1");
-
-program
-  .command("init")
-  .description("Install spec2impl slash command and agents to current project")
-  .argument("[directory]", "Target project directory", ".")
-  .option("-f, --force", "Overwrite all existing files (including user files)")
-  .option("--dry-run", "Preview files without installing")
-  .option("--detect-stack", "Detect tech stack from project files (package.json, etc.)")
-  .action((directory: string, options: InstallOptions) => {
-    install(directory, options);
-  });
-
-// デフォルトコマンド（引数なしで実行した場合）
-program
-  .argument("[directory]", "Target project directory (defaults to current directory)")
-  .option("-f, --force", "Overwrite all existing files (including user files)")
-  .option("--dry-run", "Preview files without installing")
-  .option("--detect-stack", "Detect tech stack from project files (package.json, etc.)")
-  .action((directory: string | undefined, options: InstallOptions) => {
-    if (directory && !directory.startsWith("-")) {
-      install(directory, options);
+/**
+ * 複数ディレクトリへ並列インストール（テンプレート走査は 1 回のみ）
+ */
+async function installAll(targets: string[], options: InstallOptions) {
+  const { colors: c, spinner: createSpinner } = await loadUi();
+  const spinner = createSpinner(`Installing spec2impl into ${targets.length} directories...`).start();
+  const metrics: InstallMetrics[] = [];
+  let done = 0;
+  let failed = 0;
+
+  for await (const result of installMany(targets, libraryOptions(options))) {
+    done++;
+    spinner.text = `Installing spec2impl... (${done}/${targets.length})`;
+
+    const label = relative(process.cwd(), resolve(result.target)) || ".";
+    const elapsed = result.metrics ? c.dim(` [${ms(result.metrics.totalMs)}]`) : "";
+    if (result.metrics) {
+      metrics.push(result.metrics);
+    }
+    spinner.stop();
+    if (result.success) {
+      console.log(
+        c.green("  ✓ ") +
+          label +
+          c.dim(
+            ` (${result.copied.length} installed, ${result.updated.length} updated, ` +
+              `${result.skipped.length} skipped, ${result.unchanged.length} unchanged)`
+          ) +
+          elapsed
+      );
     } else {
-      install(".", options);
+      failed++;
+      console.log(c.red("  ✗ ") + label + c.red(` ${result.error}`) + elapsed);
     }
-  });
+    spinner.start();
+  }
+
+  writeTrace(traceFile(options), metrics);
+
+  if (failed > 0) {
+    spinner.fail(c.red(`Installation failed in ${failed} of ${targets.length} directories`));
+  } else {
+    spinner.succeed(c.green(`spec2impl installed into ${targets.length} directories!`));
+  }
+  if (metrics.length > 0) {
+    printMetrics(c, combineInstallMetrics(metrics));
+  }
+  if (failed > 0) {
+    process.exit(1);
+  }
+}
+
+/**
+ * ドライラン: インストール計画を表示するのみ（ファイルシステムには書き込まない）
+ */
+async function showPlans(targets: string[], options: InstallOptions) {
+  let plans: InstallPlan[];
+  let metrics: InstallMetrics[] | undefined;
+  try {
+    ({ plans, metrics } = createInstallPlansWithMetrics(targets, libraryOptions(options)));
+  } catch (error) {
+    const { colors: c } = await loadUi();
+    console.error(c.red(error instanceof Error ? error.message : String(error)));
+    process.exit(1);
+  }
+
+  // ドライランでもトレースを出力（テンプレート走査とプローブのみ）
+  writeTrace(traceFile(options), metrics ?? []);
 
-program.parse();
+  if (options.json) {
+    // 相対パス・mtime なしの形式（リポジトリ間で diff できるように）
+    const portable = plans.map((plan) => planToJSON(plan));
+    console.log(JSON.stringify(portable.length === 1 ? portable[0] : portable, null, 2));
+    if (metrics) {
+      printMetrics((await loadUi()).colors, combineInstallMetrics(metrics));
+    }
+    return;
+  }
+
+  const { colors: c } = await loadUi();
+  console.log(c.cyan("ℹ Dry run mode - no files will be created"));
+  for (const plan of plans) {
+    console.log("");
+    console.log(
+      c.bold(
+        plans.length === 1
+          ? "Files to be installed:"
+          : `Files to be installed in ${relative(process.cwd(), plan.target) || "."}:`
+      )
+    );
+
+    for (const file of plan.files) {
+      const path = `  .claude/${file.path}`;
+      switch (file.action) {
+        case "update":
+          console.log(c.cyan(`${path} (update)`));
+          break;
+        case "skip":
+          console.log(c.yellow(`${path} (skip - exists)`));
+          break;
+        case "overwrite":
+          console.log(c.cyan(`${path} (overwrite)`));
+          break;
+        case "unchanged":
+          console.log(c.dim(`${path} (unchanged)`));
+          break;
+        default:
+          console.log(c.green(path));
+      }
+    }
+  }
+
+  if (metrics) {
+    console.log("");
+    printMetrics(c, combineInstallMetrics(metrics));
+  }
+}
+
+interface TasksOptions {
+  update?: boolean;
+  json?: boolean;
+  next: number;
+}
+
+/**
+ * TASKS.md の進捗と次に着手可能なタスクを表示（--update で Summary/Progress を更新）
+ */
+async function showTasks(file: string, options: TasksOptions) {
+  const { colors: c } = await loadUi();
+  const { nextUnblockedTasks, parseTasks, summarizeTasks, updateTasksFile } =
+    await import("./tasks.js");
+
+  if (!existsSync(file)) {
+    console.error(c.red(`Task list not found: ${file}`));
+    process.exit(1);
+  }
+
+  try {
+    const graph = options.update
+      ? updateTasksFile(file).graph
+      : parseTasks(readFileSync(file, "utf-8"));
+    const summary = summarizeTasks(graph).total;
+    const next = nextUnblockedTasks(graph, options.next);
+
+    if (options.json) {
+      console.log(JSON.stringify({ summary, next }, null, 2));
+      return;
+    }
+
+    console.log(
+      `✅ Completed: ${summary.completed} | 🔄 In Progress: ${summary.inProgress} | 🔲 Pending: ${summary.pending}`
+    );
+    if (next.length > 0) {
+      console.log("");
+      console.log(c.bold("Next tasks:"));
+      for (const task of next) {
+        console.log(`  ${c.cyan(task.id)} ${task.title}`);
+      }
+    }
+  } catch (error) {
+    console.error(c.red(error instanceof Error ? error.message : String(error)));
+    process.exit(1);
+  }
+}
+
+function run(targets: string[], options: InstallOptions): Promise<void> {
+  if (options.dryRun) {
+    return showPlans(targets, options);
+  }
+  if (targets.length === 1) {
+    return install(targets[0], options);
+  }
+  return installAll(targets, options);
+}
+
+/**
+ * commander は --version 以外で必要になった時点で読み込む
+ */
+async function main() {
+  const { InvalidArgumentError, program } = await import("commander");
+
+  const parsePositiveInt = (value: string): number => {
+    const n = Number.parseInt(value, 10);
+    if (!Number.isInteger(n) || n < 1) {
+      throw new InvalidArgumentError("Must be a positive integer.");
+    }
+    return n;
+  };
+
+  program
+    .name("spec2impl")
+    .description("Generate Claude Code implementation environment from specification documents")
+    .version(CLI_VERSION);
+
+  program
+    .command("init")
+    .description("Install spec2impl slash command and agents to current project")
+    .argument(
+      "[directories...]",
+      "Target project directories or glob patterns (* and ? within a path segment; no **, {a,b} or [ab])",
+      ["."]
+    )
+    .option("-f, --force", "Overwrite all existing files (including user files)")
+    .option("--dry-run", "Preview files without installing")
+    .option("--json", "With --dry-run, print the install plan as JSON")
+    .option("--detect-stack", "Detect tech stack from project files (package.json, etc.)")
+    .option("-j, --jobs <n>", "Number of files to copy in parallel", parsePositiveInt, 1)
+    .option("--no-reflink", "Disable copy-on-write clones (always byte copy)")
+    .option("--trace [file]", "Report phase timings and I/O counts; write a Chrome trace to <file>")
+    .option(
+      "-c, --concurrency <n>",
+      "Number of directories to install into at the same time",
+      parsePositiveInt,
+      4
+    )
+    .action((directories: string[], options: InstallOptions) => {
+      let targets: string[];
+      try {
+        targets = expandTargets(directories);
+      } catch (error) {
+        console.error(error instanceof Error ? error.message : String(error));
+        process.exit(1);
+      }
+      if (targets.length === 0) {
+        console.error(`No directories match: ${directories.join(" ")}`);
+        process.exit(1);
+      }
+      return run(targets, options);
+    });
+
+  program
+    .command("tasks")
+    .description("Show task progress and the next unblocked tasks from TASKS.md")
+    .argument("[file]", "Task list file", "docs/TASKS.md")
+    .option("-u, --update", "Rewrite the Summary and Progress sections in place")
+    .option("--json", "Print the summary and next tasks as JSON")
+    .option("-n, --next <n>", "Number of next tasks to show", parsePositiveInt, 5)
+    .action((file: string, options: TasksOptions) => showTasks(file, options));
+
+  // デフォルトコマンド（引数なしで実行した場合）
+  program
+    .argument("[directory]", "Target project directory (defaults to current directory)")
+    .option("-f, --force", "Overwrite all existing files (including user files)")
+    .option("--dry-run", "Preview files without installing")
+    .option("--json", "With --dry-run, print the install plan as JSON")
+    .option("--detect-stack", "Detect tech stack from project files (package.json, etc.)")
+    .option("-j, --jobs <n>", "Number of files to copy in parallel", parsePositiveInt, 1)
+    .option("--no-reflink", "Disable copy-on-write clones (always byte copy)")
+    .option("--trace [file]", "Report phase timings and I/O counts; write a Chrome trace to <file>")
+    .action((directory: string | undefined, options: InstallOptions) => {
+      if (directory && !directory.startsWith("-")) {
+        return run([directory], options);
+      }
+      return run(["."], options);
+    });
+
+  await program.parseAsync();
+}
+
+// --version はどのライブラリも読み込まずに即答（CI でのコールドスタート対策）
+const args = process.argv.slice(2);
+if (args.length === 1 && (args[0] === "--version" || args[0] === "-V")) {
+  console.log(CLI_VERSION);
+} else {
+  await main();
+}
@@ -7,4 +7,64 @@
 
 export const VERSION = "0.1.0";
 
-export { install } from "./installer.js";
+export {
+  install,
+  installAsync,
+  installMany,
+  createInstallPlan,
+  createInstallPlans,
+  createInstallPlansWithMetrics,
+  applyInstallPlan,
+  applyInstallPlanAsync,
+  planToResult,
+} from "./installer.js";
+export type {
+  InstallOptions,
+  InstallManyOptions,
+  InstallResult,
+  TargetInstallResult,
+} from "./installer.js";
+export { planToJSON } from "./plan.js";
+export type {
+  InstallPlan,
+  PlannedFile,
+  InstallAction,
+  PortableInstallPlan,
+} from "./plan.js";
+export { combineInstallMetrics, toChromeTrace } from "./trace.js";
+export type {
+  InstallMetrics,
+  AnalyzeMetrics,
+  TraceEvent,
+  TraceMetrics,
+  SyscallKind,
+} from "./trace.js";
+export { buildManifest } from "./manifest.js";
+export type { TemplateManifest, ManifestEntry } from "./manifest.js";
+export {
+  analyzeSpecs,
+  mergeAnalyses,
+  parseMarkdownSpec,
+  MarkdownSpecParser,
+  ANALYSIS_CACHE_FILE,
+  streamSpecRecords,
+  streamSpecRecordsParallel,
+  analyzeSpecFiles,
+} from "./analyzer/index.js";
+export type {
+  AnalyzeOptions,
+  AnalyzeResult,
+  SpecAnalysis,
+  SpecRecord,
+  SourcedRecord,
+  StreamOptions,
+} from "./analyzer/index.js";
+export {
+  parseTasks,
+  topologicalOrder,
+  nextUnblockedTasks,
+  summarizeTasks,
+  updateTasksContent,
+  updateTasksFile,
+} from "./tasks.js";
+export type { Task, TaskGraph, TaskStatus, TaskSummary, CategorySummary } from "./tasks.js";
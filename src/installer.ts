@@ -1,123 +1,447 @@
 import { fileURLToPath } from "url";
-import { dirname, join, resolve } from "path";
+import { dirname, join } from "path";
+import { constants, existsSync, mkdirSync, copyFileSync } from "fs";
+import { copyFile, mkdir, stat } from "fs/promises";
 import {
-  existsSync,
-  mkdirSync,
-  copyFileSync,
-  readdirSync,
-  statSync,
-} from "fs";
+  MANIFEST_FILE,
+  STATE_FILE,
+  loadManifest,
+  tryStat,
+  writeInstallState,
+  writeInstallStateAsync,
+  type TemplateManifest,
+} from "./manifest.js";
+import {
+  claudeDirOf,
+  needsCopy,
+  planInstall,
+  planInstallAsync,
+  stateAfter,
+  type FileStamp,
+  type InstallPlan,
+  type PlannedFile,
+} from "./plan.js";
+import {
+  INSTALL_PHASES,
+  Tracer,
+  installMetrics,
+  span,
+  spanAsync,
+  traceEnabled,
+  type InstallMetrics,
+  type InstallPhase,
+  type TraceMetrics,
+} from "./trace.js";
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = dirname(__filename);
 
 const TEMPLATES_DIR = join(__dirname, "..", "templates");
+const TEMPLATE_CLAUDE_DIR = join(TEMPLATES_DIR, ".claude");
+const MANIFEST_PATH = join(TEMPLATES_DIR, MANIFEST_FILE);
+// src/ があるのは開発チェックアウトのみ（公開パッケージは dist/ と templates/）
+const SOURCE_DIR = join(__dirname, "..", "src");
+
+const TEMPLATES_MISSING = "Template directory not found. Package may be corrupted.";
 
 export interface InstallOptions {
   force?: boolean;
   dryRun?: boolean;
+  /** Try copy-on-write clones before falling back to a byte copy (default: true) */
+  reflink?: boolean;
+  /** Number of concurrent file copies per target in installAsync/installMany (default: 1) */
+  jobs?: number;
+  /** Collect InstallResult.metrics (default: SPEC2IMPL_TRACE is set) */
+  trace?: boolean;
+}
+
+export interface InstallManyOptions extends InstallOptions {
+  /** Number of target directories installed at the same time (default: 4) */
+  concurrency?: number;
 }
 
 export interface InstallResult {
   success: boolean;
   copied: string[];
+  updated: string[];
   skipped: string[];
+  unchanged: string[];
   error?: string;
+  /** Phase timings and I/O counts, only when tracing is enabled */
+  metrics?: InstallMetrics;
+}
+
+export interface TargetInstallResult extends InstallResult {
+  target: string;
 }
 
-function copyFilesRecursively(
-  srcDir: string,
-  destDir: string,
-  force: boolean
-): { copied: string[]; skipped: string[] } {
-  const copied: string[] = [];
-  const skipped: string[] = [];
+function failedResult(error: string): InstallResult {
+  return {
+    success: false,
+    copied: [],
+    updated: [],
+    skipped: [],
+    unchanged: [],
+    error,
+  };
+}
+
+function errorMessage(error: unknown): string {
+  return error instanceof Error ? error.message : String(error);
+}
+
+type InstallTracer = Tracer<InstallPhase>;
 
-  function processDir(src: string, dest: string, relativePath = "") {
-    if (!existsSync(dest)) {
-      mkdirSync(dest, { recursive: true });
+function createTracer(
+  options: InstallOptions,
+  target: string,
+  tid = 1
+): InstallTracer | undefined {
+  return traceEnabled(options.trace)
+    ? new Tracer(INSTALL_PHASES, "install", target, tid)
+    : undefined;
+}
+
+function withMetrics(
+  result: InstallResult,
+  trace: InstallTracer | undefined,
+  shared?: TraceMetrics<InstallPhase>
+): InstallResult {
+  return trace ? { ...result, metrics: installMetrics(trace, shared) } : result;
+}
+
+function loadTemplateManifest(trace?: InstallTracer): TemplateManifest {
+  return span(trace, "templateScan", () => {
+    trace?.count("exists");
+    if (!existsSync(TEMPLATES_DIR)) {
+      throw new Error(TEMPLATES_MISSING);
     }
+    trace?.count("exists");
+    const devCheckout = existsSync(SOURCE_DIR);
+    return loadManifest(MANIFEST_PATH, TEMPLATE_CLAUDE_DIR, trace, devCheckout);
+  });
+}
+
+function copyMode(options: InstallOptions): number {
+  return options.reflink === false ? 0 : constants.COPYFILE_FICLONE;
+}
+
+function copyDirs(plan: InstallPlan, files: PlannedFile[]): string[] {
+  const claudeDir = claudeDirOf(plan);
+  return [...new Set(files.map((file) => dirname(join(claudeDir, file.path))))];
+}
+
+/**
+ * Summarize a plan as an InstallResult (what was, or would be, done)
+ */
+export function planToResult(plan: InstallPlan): InstallResult {
+  const paths = (...actions: string[]) =>
+    plan.files
+      .filter((file) => actions.includes(file.action))
+      .map((file) => `.claude/${file.path}`);
+
+  return {
+    success: true,
+    copied: paths("copy", "overwrite"),
+    updated: paths("update"),
+    skipped: paths("skip"),
+    unchanged: paths("unchanged"),
+  };
+}
+
+/**
+ * Build the install plan for a target directory
+ * Nothing is written; the plan is immutable and can be serialized with JSON.stringify
+ */
+export function createInstallPlan(
+  targetDir: string,
+  options: InstallOptions = {}
+): InstallPlan {
+  return planInstall(loadTemplateManifest(), targetDir, options.force || false);
+}
+
+/**
+ * Build install plans for several targets, loading the template manifest once
+ */
+export function createInstallPlans(
+  targetDirs: string[],
+  options: InstallOptions = {}
+): InstallPlan[] {
+  return createInstallPlansWithMetrics(targetDirs, { ...options, trace: false }).plans;
+}
+
+/**
+ * createInstallPlans with metrics when tracing is enabled (--dry-run --trace)
+ * As with installMany, each target's metrics cover its own probe and the
+ * template scan is reported once as `metrics.shared`.
+ */
+export function createInstallPlansWithMetrics(
+  targetDirs: string[],
+  options: InstallOptions = {}
+): { plans: InstallPlan[]; metrics?: InstallMetrics[] } {
+  const scanTrace = createTracer(options, "templates", 0);
+  const manifest = loadTemplateManifest(scanTrace);
+  const shared = scanTrace?.metrics();
 
-    const entries = readdirSync(src);
-
-    for (const entry of entries) {
-      const srcPath = join(src, entry);
-      const destPath = join(dest, entry);
-      const relPath = relativePath ? join(relativePath, entry) : entry;
-
-      if (statSync(srcPath).isDirectory()) {
-        processDir(srcPath, destPath, relPath);
-      } else {
-        if (existsSync(destPath) && !force) {
-          skipped.push(relPath);
-        } else {
-          const parentDir = dirname(destPath);
-          if (!existsSync(parentDir)) {
-            mkdirSync(parentDir, { recursive: true });
-          }
-          copyFileSync(srcPath, destPath);
-          copied.push(relPath);
-        }
-      }
+  const plans: InstallPlan[] = [];
+  const metrics: InstallMetrics[] = [];
+  for (const [index, targetDir] of targetDirs.entries()) {
+    const trace = createTracer(options, targetDir, index + 1);
+    plans.push(
+      span(trace, "targetProbe", () =>
+        planInstall(manifest, targetDir, options.force || false, trace)
+      )
+    );
+    if (trace) {
+      metrics.push(installMetrics(trace, shared));
     }
   }
+  return scanTrace ? { plans, metrics } : { plans };
+}
+
+function applyPlan(
+  plan: InstallPlan,
+  options: InstallOptions,
+  trace?: InstallTracer
+): InstallResult {
+  const claudeDir = claudeDirOf(plan);
+  const files = plan.files.filter(needsCopy);
+  const mode = copyMode(options);
+  const written = new Map<string, FileStamp>();
 
-  processDir(srcDir, destDir);
-  return { copied, skipped };
+  span(trace, "copy", () => {
+    const dirs = copyDirs(plan, files);
+    for (const dir of dirs) {
+      mkdirSync(dir, { recursive: true });
+    }
+    trace?.count("mkdir", dirs.length);
+
+    for (const file of files) {
+      const destPath = join(claudeDir, file.path);
+      copyFileSync(join(TEMPLATE_CLAUDE_DIR, file.path), destPath, mode);
+      const { size, mtimeMs } = tryStat(destPath)!;
+      written.set(file.path, { size, mtimeMs });
+    }
+    countCopies(trace, files);
+  });
+
+  return span(trace, "report", () => {
+    const state = stateAfter(plan, written);
+    if (state) {
+      mkdirSync(claudeDir, { recursive: true });
+      writeInstallState(join(claudeDir, STATE_FILE), state);
+      trace?.count("mkdir");
+      trace?.count("write");
+    }
+    return planToResult(plan);
+  });
+}
+
+async function applyPlanAsync(
+  plan: InstallPlan,
+  options: InstallOptions,
+  trace?: InstallTracer
+): Promise<InstallResult> {
+  const claudeDir = claudeDirOf(plan);
+  const files = plan.files.filter(needsCopy);
+  const mode = copyMode(options);
+  const written = new Map<string, FileStamp>();
+
+  await spanAsync(trace, "copy", async () => {
+    const dirs = copyDirs(plan, files);
+    await Promise.all(dirs.map((dir) => mkdir(dir, { recursive: true })));
+    trace?.count("mkdir", dirs.length);
+
+    await runPool(files, limitOf(options.jobs, 1), async (file) => {
+      const destPath = join(claudeDir, file.path);
+      await copyFile(join(TEMPLATE_CLAUDE_DIR, file.path), destPath, mode);
+      const { size, mtimeMs } = await stat(destPath);
+      written.set(file.path, { size, mtimeMs });
+    });
+    countCopies(trace, files);
+  });
+
+  return spanAsync(trace, "report", async () => {
+    const state = stateAfter(plan, written);
+    if (state) {
+      await mkdir(claudeDir, { recursive: true });
+      await writeInstallStateAsync(join(claudeDir, STATE_FILE), state);
+      trace?.count("mkdir");
+      trace?.count("write");
+    }
+    return planToResult(plan);
+  });
+}
+
+// コピー 1 件につき copyFile + stat（状態記録用）
+function countCopies(trace: InstallTracer | undefined, files: PlannedFile[]) {
+  if (trace) {
+    trace.count("copy", files.length);
+    trace.count("stat", files.length);
+    trace.bytes += files.reduce((total, file) => total + file.size, 0);
+  }
+}
+
+/**
+ * Execute a plan created by createInstallPlan
+ */
+export function applyInstallPlan(
+  plan: InstallPlan,
+  options: InstallOptions = {}
+): InstallResult {
+  const trace = createTracer(options, plan.target);
+  return withMetrics(applyPlan(plan, options, trace), trace);
+}
+
+export async function applyInstallPlanAsync(
+  plan: InstallPlan,
+  options: InstallOptions = {}
+): Promise<InstallResult> {
+  const trace = createTracer(options, plan.target);
+  return withMetrics(await applyPlanAsync(plan, options, trace), trace);
 }
 
 /**
  * Install spec2impl templates to a target directory
- * Merges with existing .claude directory without overwriting (unless force is true)
+ * Merges with existing .claude directory. spec2impl-managed files
+ * (commands/spec2impl.md, agents/spec2impl/, skills/skill-creator/) are
+ * always updated; other existing files are only overwritten when force is true.
+ * Files unchanged since the previous install are not rewritten
  */
 export function install(
   targetDir: string,
   options: InstallOptions = {}
 ): InstallResult {
-  const projectRoot = resolve(targetDir);
-  const claudeDir = join(projectRoot, ".claude");
-  const templateClaudeDir = join(TEMPLATES_DIR, ".claude");
-
-  if (!existsSync(TEMPLATES_DIR)) {
-    return {
-      success: false,
-      copied: [],
-      skipped: [],
-      error: "Template directory not found. Package may be corrupted.",
-    };
+  const trace = createTracer(options, targetDir);
+  try {
+    const manifest = loadTemplateManifest(trace);
+    const plan = span(trace, "targetProbe", () =>
+      planInstall(manifest, targetDir, options.force || false, trace)
+    );
+    const result = options.dryRun
+      ? span(trace, "report", () => planToResult(plan))
+      : applyPlan(plan, options, trace);
+    return withMetrics(result, trace);
+  } catch (error) {
+    return withMetrics(failedResult(errorMessage(error)), trace);
   }
+}
 
-  if (options.dryRun) {
-    // Dry run: just list files that would be copied
-    const { copied, skipped } = copyFilesRecursively(
-      templateClaudeDir,
-      claudeDir,
-      options.force || false
+async function installWithManifest(
+  manifest: TemplateManifest,
+  targetDir: string,
+  options: InstallOptions,
+  trace: InstallTracer | undefined,
+  shared?: TraceMetrics<InstallPhase>
+): Promise<InstallResult> {
+  try {
+    const plan = await spanAsync(trace, "targetProbe", () =>
+      planInstallAsync(manifest, targetDir, options.force || false, trace)
     );
-    return {
-      success: true,
-      copied: copied.map((f) => `.claude/${f}`),
-      skipped: skipped.map((f) => `.claude/${f}`),
-    };
+    const result = options.dryRun
+      ? span(trace, "report", () => planToResult(plan))
+      : await applyPlanAsync(plan, options, trace);
+    return withMetrics(result, trace, shared);
+  } catch (error) {
+    return withMetrics(failedResult(errorMessage(error)), trace, shared);
   }
+}
 
+/**
+ * Asynchronous variant of install() that copies up to `jobs` files concurrently
+ */
+export async function installAsync(
+  targetDir: string,
+  options: InstallOptions = {}
+): Promise<InstallResult> {
+  const trace = createTracer(options, targetDir);
   try {
-    const { copied, skipped } = copyFilesRecursively(
-      templateClaudeDir,
-      claudeDir,
-      options.force || false
-    );
-    return {
-      success: true,
-      copied: copied.map((f) => `.claude/${f}`),
-      skipped: skipped.map((f) => `.claude/${f}`),
-    };
+    return await installWithManifest(loadTemplateManifest(trace), targetDir, options, trace);
   } catch (error) {
-    return {
-      success: false,
-      copied: [],
-      skipped: [],
-      error: error instanceof Error ? error.message : String(error),
-    };
+    return withMetrics(failedResult(errorMessage(error)), trace);
   }
 }
+
+/**
+ * Install into many target directories, up to `concurrency` at a time
+ * The template manifest is loaded once and shared by every target.
+ * Results are yielded in completion order, not input order.
+ * With tracing, each target's metrics cover only that target; the shared
+ * template scan is reported once as `metrics.shared`.
+ */
+export async function* installMany(
+  targets: string[],
+  options: InstallManyOptions = {}
+): AsyncGenerator<TargetInstallResult> {
+  const scanTrace = createTracer(options, "templates", 0);
+  let manifest: TemplateManifest;
+  try {
+    manifest = loadTemplateManifest(scanTrace);
+  } catch (error) {
+    const shared = scanTrace?.metrics();
+    for (const [index, target] of targets.entries()) {
+      const trace = createTracer(options, target, index + 1);
+      yield { target, ...withMetrics(failedResult(errorMessage(error)), trace, shared) };
+    }
+    return;
+  }
+  const shared = scanTrace?.metrics();
+
+  const concurrency = limitOf(options.concurrency, 4);
+  const inFlight = new Map<number, Promise<[number, TargetInstallResult]>>();
+  let next = 0;
+
+  const launch = () => {
+    const index = next++;
+    const target = targets[index];
+    const trace = createTracer(options, target, index + 1);
+    inFlight.set(
+      index,
+      installWithManifest(manifest, target, options, trace, shared).then(
+        (result): [number, TargetInstallResult] => [index, { target, ...result }]
+      )
+    );
+  };
+
+  while (next < targets.length && inFlight.size < concurrency) {
+    launch();
+  }
+
+  while (inFlight.size > 0) {
+    const [index, result] = await Promise.race(inFlight.values());
+    inFlight.delete(index);
+    if (next < targets.length) {
+      launch();
+    }
+    yield result;
+  }
+}
+
+/**
+ * Normalize a concurrency option to an integer >= 1
+ * undefined and NaN fall back to the default; Infinity means no limit.
+ */
+function limitOf(value: number | undefined, fallback: number): number {
+  if (value === undefined || Number.isNaN(value)) {
+    return fallback;
+  }
+  return Math.max(1, Math.floor(value));
+}
+
+/**
+ * Run worker over items with at most `concurrency` calls in flight
+ */
+async function runPool<T>(
+  items: T[],
+  concurrency: number,
+  worker: (item: T) => Promise<void>
+): Promise<void> {
+  let next = 0;
+  const run = async () => {
+    while (next < items.length) {
+      await worker(items[next++]);
+    }
+  };
+  const size = Math.max(1, Math.min(concurrency, items.length));
+  await Promise.all(Array.from({ length: size }, run));
+}
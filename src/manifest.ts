@@ -0,0 +1,238 @@
+import { createHash } from "crypto";
+import { join } from "path";
+import {
+  existsSync,
+  readFileSync,
+  readdirSync,
+  statSync,
+  writeFileSync,
+} from "fs";
+import { readFile, writeFile } from "fs/promises";
+import type { IoCounter } from "./trace.js";
+
+// テンプレートディレクトリ直下に置く事前計算済みマニフェスト
+export const MANIFEST_FILE = "manifest.json";
+
+// インストール先 .claude/ に置くインストール状態ファイル
+export const STATE_FILE = ".spec2impl-state.json";
+
+export interface ManifestEntry {
+  path: string;
+  size: number;
+  hash: string;
+}
+
+export interface TemplateManifest {
+  version: 1;
+  hash: string;
+  entries: ManifestEntry[];
+}
+
+export interface InstalledFileState {
+  hash: string;
+  size: number;
+  mtimeMs: number;
+}
+
+export interface InstallState {
+  version: 1;
+  manifestHash: string;
+  files: Record<string, InstalledFileState>;
+}
+
+export function hashContent(content: Buffer | string): string {
+  return createHash("sha256").update(content).digest("hex");
+}
+
+function hashEntries(entries: ManifestEntry[]): string {
+  const hash = createHash("sha256");
+  for (const entry of entries) {
+    hash.update(`${entry.path}\0${entry.size}\0${entry.hash}\n`);
+  }
+  return hash.digest("hex");
+}
+
+/**
+ * Build a manifest (paths, sizes, content hashes) for a template tree
+ * Paths are relative to templateDir and always use "/" separators
+ */
+export function buildManifest(templateDir: string, io?: IoCounter): TemplateManifest {
+  const entries: ManifestEntry[] = [];
+
+  function walk(dir: string, base: string) {
+    const dirents = readdirSync(dir, { withFileTypes: true });
+    io?.count("readdir");
+
+    for (const dirent of dirents) {
+      const fullPath = join(dir, dirent.name);
+      const relPath = base ? `${base}/${dirent.name}` : dirent.name;
+
+      if (dirent.isDirectory()) {
+        walk(fullPath, relPath);
+      } else {
+        const content = readFileSync(fullPath);
+        io?.count("read");
+        entries.push({
+          path: relPath,
+          size: content.length,
+          hash: hashContent(content),
+        });
+      }
+    }
+  }
+
+  walk(templateDir, "");
+  entries.sort((a, b) => (a.path < b.path ? -1 : a.path > b.path ? 1 : 0));
+
+  return { version: 1, hash: hashEntries(entries), entries };
+}
+
+/**
+ * Check a manifest against the template tree without hashing
+ * The file list and sizes must match, and no template file may be newer
+ * than the manifest itself.
+ */
+function matchesTemplateTree(
+  manifest: TemplateManifest,
+  manifestMtimeMs: number,
+  templateDir: string,
+  io?: IoCounter
+): boolean {
+  const sizes = new Map(manifest.entries.map((entry) => [entry.path, entry.size]));
+  let seen = 0;
+
+  function walk(dir: string, base: string): boolean {
+    io?.count("readdir");
+    for (const dirent of readdirSync(dir, { withFileTypes: true })) {
+      const fullPath = join(dir, dirent.name);
+      const relPath = base ? `${base}/${dirent.name}` : dirent.name;
+
+      if (dirent.isDirectory()) {
+        if (!walk(fullPath, relPath)) return false;
+        continue;
+      }
+
+      io?.count("stat");
+      const stats = statSync(fullPath);
+      if (sizes.get(relPath) !== stats.size || stats.mtimeMs > manifestMtimeMs) {
+        return false;
+      }
+      seen++;
+    }
+    return true;
+  }
+
+  return walk(templateDir, "") && seen === sizes.size;
+}
+
+/**
+ * Load the precomputed manifest shipped with the package
+ * Falls back to scanning the template tree when the manifest is missing or
+ * unreadable. With `verify` (development checkouts, where templates can be
+ * edited without rerunning `npm run manifest`) a stale manifest is rebuilt
+ * too; published packages skip that per-file walk.
+ */
+export function loadManifest(
+  manifestPath: string,
+  templateDir: string,
+  io?: IoCounter,
+  verify = false
+): TemplateManifest {
+  io?.count("stat");
+  const stats = tryStat(manifestPath);
+  if (stats) {
+    io?.count("read");
+    try {
+      const manifest = JSON.parse(
+        readFileSync(manifestPath, "utf-8")
+      ) as TemplateManifest;
+      if (
+        manifest.version === 1 &&
+        Array.isArray(manifest.entries) &&
+        (!verify || matchesTemplateTree(manifest, stats.mtimeMs, templateDir, io))
+      ) {
+        return manifest;
+      }
+    } catch {
+      // 壊れたマニフェストは無視して再計算
+    }
+  }
+
+  return buildManifest(templateDir, io);
+}
+
+export function writeManifest(
+  manifestPath: string,
+  manifest: TemplateManifest
+): void {
+  writeFileSync(manifestPath, JSON.stringify(manifest, null, 2) + "\n");
+}
+
+export function readInstallState(
+  statePath: string,
+  io?: IoCounter
+): InstallState | undefined {
+  io?.count("exists");
+  if (!existsSync(statePath)) {
+    return undefined;
+  }
+
+  io?.count("read");
+  try {
+    return parseInstallState(readFileSync(statePath, "utf-8"));
+  } catch {
+    return undefined;
+  }
+}
+
+function parseInstallState(content: string): InstallState | undefined {
+  const state = JSON.parse(content) as InstallState;
+  return state.version === 1 && state.files ? state : undefined;
+}
+
+export async function readInstallStateAsync(
+  statePath: string,
+  io?: IoCounter
+): Promise<InstallState | undefined> {
+  io?.count("read");
+  try {
+    return parseInstallState(await readFile(statePath, "utf-8"));
+  } catch {
+    return undefined;
+  }
+}
+
+export function writeInstallState(statePath: string, state: InstallState): void {
+  writeFileSync(statePath, JSON.stringify(state, null, 2) + "\n");
+}
+
+export async function writeInstallStateAsync(
+  statePath: string,
+  state: InstallState
+): Promise<void> {
+  await writeFile(statePath, JSON.stringify(state, null, 2) + "\n");
+}
+
+/**
+ * Check whether a target file is still byte-identical to the template entry
+ * Uses the recorded size/mtime so unchanged files cost a single stat
+ */
+export function isUpToDate(
+  hash: string,
+  recorded: InstalledFileState | undefined,
+  target: { size: number; mtimeMs: number }
+): boolean {
+  return (
+    recorded !== undefined &&
+    recorded.hash === hash &&
+    recorded.size === target.size &&
+    recorded.mtimeMs === target.mtimeMs
+  );
+}
+
+/**
+ * Stat a path, returning undefined when it does not exist
+ */
+export function tryStat(path: string) {
+  return statSync(path, { throwIfNoEntry: false });
+}
@@ -0,0 +1,217 @@
+import { join, relative, resolve, sep } from "path";
+import { stat } from "fs/promises";
+import {
+  STATE_FILE,
+  isUpToDate,
+  readInstallState,
+  readInstallStateAsync,
+  tryStat,
+  type InstallState,
+  type TemplateManifest,
+} from "./manifest.js";
+import type { IoCounter } from "./trace.js";
+
+// spec2impl が管理するパス（常に上書き対象）
+const SPEC2IMPL_PATHS = [
+  "commands/spec2impl.md",
+  "agents/spec2impl/",
+  "skills/skill-creator/",
+];
+
+/**
+ * - copy: target file does not exist
+ * - update: spec2impl-managed file is replaced
+ * - overwrite: user file is replaced because of --force
+ * - skip: user file is kept
+ * - unchanged: target still matches the previously installed template
+ */
+export type InstallAction = "copy" | "update" | "overwrite" | "skip" | "unchanged";
+
+export interface FileStamp {
+  readonly size: number;
+  readonly mtimeMs: number;
+}
+
+export interface PlannedFile {
+  /** Path relative to .claude/ using "/" separators */
+  readonly path: string;
+  readonly action: InstallAction;
+  readonly size: number;
+  readonly hash: string;
+  /** Target file stat at planning time, null when it does not exist */
+  readonly target: FileStamp | null;
+}
+
+export interface InstallPlan {
+  readonly version: 1;
+  /** Absolute path of the project root */
+  readonly target: string;
+  readonly force: boolean;
+  readonly manifestHash: string;
+  /** Manifest hash recorded by the previous install, null on first install */
+  readonly recordedManifestHash: string | null;
+  readonly files: readonly PlannedFile[];
+}
+
+/**
+ * Machine-independent form of an InstallPlan for diffing across repositories
+ * The target is relative and stat details (mtimes) are left out.
+ */
+export interface PortableInstallPlan {
+  version: 1;
+  /** Project root relative to the base directory, "/" separators */
+  target: string;
+  force: boolean;
+  manifestHash: string;
+  recordedManifestHash: string | null;
+  files: { path: string; action: InstallAction; size: number; hash: string }[];
+}
+
+/**
+ * ファイルが spec2impl 管理下かどうかを判定
+ */
+export function isSpec2implManagedPath(relativePath: string): boolean {
+  return SPEC2IMPL_PATHS.some(
+    (managedPath) =>
+      relativePath === managedPath ||
+      relativePath.startsWith(managedPath)
+  );
+}
+
+export function claudeDirOf(plan: InstallPlan): string {
+  return join(plan.target, ".claude");
+}
+
+function decide(
+  path: string,
+  hash: string,
+  recorded: InstallState["files"][string] | undefined,
+  target: FileStamp | undefined,
+  force: boolean
+): InstallAction {
+  if (!target) {
+    return "copy";
+  }
+
+  // 前回インストール時から変更がなければ書き込み不要
+  if (isUpToDate(hash, recorded, target)) {
+    return "unchanged";
+  }
+
+  // spec2impl 管理ファイルは常に上書き、それ以外は force が必要
+  if (isSpec2implManagedPath(path)) {
+    return "update";
+  }
+  return force ? "overwrite" : "skip";
+}
+
+function buildPlan(
+  manifest: TemplateManifest,
+  projectRoot: string,
+  state: InstallState | undefined,
+  targets: (FileStamp | undefined)[],
+  force: boolean
+): InstallPlan {
+  const files = manifest.entries.map((entry, i) => {
+    const target = targets[i];
+    return Object.freeze({
+      path: entry.path,
+      action: decide(entry.path, entry.hash, state?.files[entry.path], target, force),
+      size: entry.size,
+      hash: entry.hash,
+      target: target ? Object.freeze({ size: target.size, mtimeMs: target.mtimeMs }) : null,
+    });
+  });
+
+  return Object.freeze({
+    version: 1 as const,
+    target: projectRoot,
+    force,
+    manifestHash: manifest.hash,
+    recordedManifestHash: state?.manifestHash ?? null,
+    files: Object.freeze(files),
+  });
+}
+
+/**
+ * Build the install plan for a target directory without writing anything
+ * Reads the install state and stats each target file once.
+ */
+export function planInstall(
+  manifest: TemplateManifest,
+  targetDir: string,
+  force = false,
+  io?: IoCounter
+): InstallPlan {
+  const projectRoot = resolve(targetDir);
+  const claudeDir = join(projectRoot, ".claude");
+  const state = readInstallState(join(claudeDir, STATE_FILE), io);
+  io?.count("stat", manifest.entries.length);
+  const targets = manifest.entries.map((entry) => tryStat(join(claudeDir, entry.path)));
+
+  return buildPlan(manifest, projectRoot, state, targets, force);
+}
+
+export async function planInstallAsync(
+  manifest: TemplateManifest,
+  targetDir: string,
+  force = false,
+  io?: IoCounter
+): Promise<InstallPlan> {
+  const projectRoot = resolve(targetDir);
+  const claudeDir = join(projectRoot, ".claude");
+  const state = await readInstallStateAsync(join(claudeDir, STATE_FILE), io);
+  io?.count("stat", manifest.entries.length);
+  const targets = await Promise.all(
+    manifest.entries.map((entry) =>
+      stat(join(claudeDir, entry.path)).catch(() => undefined)
+    )
+  );
+
+  return buildPlan(manifest, projectRoot, state, targets, force);
+}
+
+/**
+ * Convert a plan to its portable JSON form (target relative to baseDir)
+ */
+export function planToJSON(
+  plan: InstallPlan,
+  baseDir = process.cwd()
+): PortableInstallPlan {
+  const target = relative(resolve(baseDir), plan.target) || ".";
+  return {
+    version: plan.version,
+    target: sep === "/" ? target : target.split(sep).join("/"),
+    force: plan.force,
+    manifestHash: plan.manifestHash,
+    recordedManifestHash: plan.recordedManifestHash,
+    files: plan.files.map(({ path, action, size, hash }) => ({ path, action, size, hash })),
+  };
+}
+
+export function needsCopy(file: PlannedFile): boolean {
+  return file.action === "copy" || file.action === "update" || file.action === "overwrite";
+}
+
+/**
+ * Build the install state to record after executing a plan
+ * Returns undefined when the recorded state is already current
+ */
+export function stateAfter(
+  plan: InstallPlan,
+  written: Map<string, FileStamp>
+): InstallState | undefined {
+  if (written.size === 0 && plan.recordedManifestHash === plan.manifestHash) {
+    return undefined;
+  }
+
+  const files: InstallState["files"] = {};
+  for (const file of plan.files) {
+    const stamp = file.action === "unchanged" ? file.target : written.get(file.path);
+    if (stamp) {
+      files[file.path] = { hash: file.hash, size: stamp.size, mtimeMs: stamp.mtimeMs };
+    }
+  }
+
+  return { version: 1, manifestHash: plan.manifestHash, files };
+}
@@ -0,0 +1,63 @@
+/**
+ * init の対象ディレクトリ指定の展開（シェルが展開しなかったグロブ）
+ */
+import { join } from "path";
+import { existsSync, readdirSync } from "fs";
+
+// 未対応のグロブ構文（**、{a,b}、[ab]）
+const UNSUPPORTED_GLOB = /\*\*|[{}[\]]/;
+
+/**
+ * ワイルドカード（* と ?）を含む引数をディレクトリ一覧に展開
+ * シェルが展開しない場合（クォートされた引数など）に使用
+ * ワイルドカードは 1 つのパス要素内でのみ有効。**、{a,b}、[ab] はエラーにする
+ */
+export function expandTargets(patterns: string[]): string[] {
+  const targets: string[] = [];
+
+  for (const pattern of patterns) {
+    // 同名のディレクトリが実在する場合はそのまま使う
+    if (UNSUPPORTED_GLOB.test(pattern) && !existsSync(pattern)) {
+      throw new Error(
+        `Unsupported glob pattern: ${pattern} (only * and ? within a single path segment are supported)`
+      );
+    }
+    if (!/[*?]/.test(pattern)) {
+      targets.push(pattern);
+      continue;
+    }
+
+    let matches = [pattern.startsWith("/") ? "/" : ""];
+    for (const segment of pattern.split("/").filter(Boolean)) {
+      if (!/[*?]/.test(segment)) {
+        matches = matches.map((base) => join(base, segment));
+        continue;
+      }
+
+      const regex = new RegExp(
+        "^" +
+          segment
+            .replace(/[.+^${}()|[\]\\]/g, "\\$&")
+            .replace(/\*/g, ".*")
+            .replace(/\?/g, ".") +
+          "$"
+      );
+      matches = matches.flatMap((base) => {
+        const dir = base || ".";
+        if (!existsSync(dir)) return [];
+        return readdirSync(dir, { withFileTypes: true })
+          .filter(
+            (dirent) =>
+              dirent.isDirectory() &&
+              (segment.startsWith(".") || !dirent.name.startsWith(".")) &&
+              regex.test(dirent.name)
+          )
+          .map((dirent) => join(base, dirent.name))
+          .sort();
+      });
+    }
+    targets.push(...matches);
+  }
+
+  return [...new Set(targets)];
+}
@@ -0,0 +1,316 @@
+import { readFileSync, writeFileSync } from "fs";
+
+/**
+ * TASKS.md の解析と進捗集計（Progress Dashboard / Task List Generator 用）
+ *
+ * Task lines look like:
+ *   - [ ] T-AUTO-003: POST /users endpoint
+ *     - Depends on: T-AUTO-001, T-AUTO-002
+ * `[x]` is completed, `[~]` / `[-]` / `[/]` or a 🔄 marker is in progress.
+ */
+
+export type TaskStatus = "pending" | "in_progress" | "completed";
+
+export interface Task {
+  id: string;
+  title: string;
+  status: TaskStatus;
+  category: string;
+  dependsOn: string[];
+  /** 0-based line number of the task line */
+  line: number;
+}
+
+export interface TaskGraph {
+  /** Tasks by ID, in document order */
+  tasks: Map<string, Task>;
+  /** Reverse edges: task ID -> IDs of tasks that depend on it */
+  dependents: Map<string, string[]>;
+  /** Categories in document order */
+  categories: string[];
+}
+
+export interface CategorySummary {
+  name: string;
+  total: number;
+  completed: number;
+  inProgress: number;
+  pending: number;
+}
+
+export interface TaskSummary {
+  categories: CategorySummary[];
+  total: CategorySummary;
+}
+
+const TASK_LINE = /^\s*[-*]\s+\[([ xX~\-/])\]\s+\**([A-Z][A-Z0-9]*(?:-[A-Z0-9]+)*-\d+)\**\s*[:：]?\s*(.*)$/;
+const DEPENDENCY_LINE = /^\s+[-*]\s+\**(?:depends on|dependencies|deps|blocked by|依存)\**\s*[:：]\s*(.*)$/i;
+const TASK_ID = /[A-Z][A-Z0-9]*(?:-[A-Z0-9]+)*-\d+/g;
+const CATEGORY_HEADING = /^#{3,4}\s+(.+?)\s*$/;
+const SECTION_HEADING = /^##\s+(.+?)\s*$/;
+const FENCE = /^\s*(```|~~~)/;
+
+const BAR_WIDTH = 50;
+
+function statusOf(mark: string, title: string): TaskStatus {
+  if (mark === "x" || mark === "X") return "completed";
+  if (mark !== " " || title.includes("🔄")) return "in_progress";
+  return "pending";
+}
+
+/**
+ * Mark lines that belong to a fenced code block (including the fences)
+ */
+function fencedLines(lines: string[]): boolean[] {
+  let inFence = false;
+  return lines.map((line) => {
+    if (FENCE.test(line)) {
+      inFence = !inFence;
+      return true;
+    }
+    return inFence;
+  });
+}
+
+function categoryOf(heading: string): string {
+  return heading
+    .replace(/^Phase\s+\d+\s*[:：]\s*/i, "")
+    .replace(/\s*\((?:continued|続き)\)$/i, "");
+}
+
+/**
+ * Parse TASKS.md into an indexed task graph
+ */
+export function parseTasks(content: string): TaskGraph {
+  const tasks = new Map<string, Task>();
+  const categories: string[] = [];
+  let category = "";
+  let current: Task | undefined;
+
+  const lines = content.split(/\r?\n/);
+  const fenced = fencedLines(lines);
+  for (let i = 0; i < lines.length; i++) {
+    const line = lines[i];
+    if (fenced[i]) {
+      continue;
+    }
+
+    const heading = CATEGORY_HEADING.exec(line);
+    if (heading) {
+      category = categoryOf(heading[1]);
+      current = undefined;
+      continue;
+    }
+    if (SECTION_HEADING.test(line)) {
+      category = "";
+      current = undefined;
+      continue;
+    }
+
+    const task = TASK_LINE.exec(line);
+    if (task) {
+      const title = task[3].trim();
+      current = {
+        id: task[2],
+        title,
+        status: statusOf(task[1], title),
+        category,
+        dependsOn: [],
+        line: i,
+      };
+      tasks.set(current.id, current);
+      if (!categories.includes(category)) {
+        categories.push(category);
+      }
+      continue;
+    }
+
+    const dependency = current && DEPENDENCY_LINE.exec(line);
+    if (dependency) {
+      for (const id of dependency[1].match(TASK_ID) ?? []) {
+        if (id !== current!.id && !current!.dependsOn.includes(id)) {
+          current!.dependsOn.push(id);
+        }
+      }
+    }
+  }
+
+  const dependents = new Map<string, string[]>();
+  for (const task of tasks.values()) {
+    for (const dep of task.dependsOn) {
+      const list = dependents.get(dep);
+      if (list) list.push(task.id);
+      else dependents.set(dep, [task.id]);
+    }
+  }
+
+  return { tasks, dependents, categories };
+}
+
+/**
+ * Insert into a list sorted by descending line number (binary search)
+ */
+function insertByLine(ready: Task[], task: Task): void {
+  let lo = 0;
+  let hi = ready.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (ready[mid].line > task.line) lo = mid + 1;
+    else hi = mid;
+  }
+  ready.splice(lo, 0, task);
+}
+
+/**
+ * Topological order of all tasks (Kahn's algorithm)
+ * Among the tasks whose dependencies are done, the earliest in the document
+ * comes first, so a later phase never jumps ahead of an unblocked earlier task.
+ * Dependencies on IDs that are not in the file are ignored.
+ * Throws if the dependency graph has a cycle.
+ */
+export function topologicalOrder(graph: TaskGraph): Task[] {
+  const indegree = new Map<string, number>();
+  for (const task of graph.tasks.values()) {
+    indegree.set(task.id, task.dependsOn.filter((dep) => graph.tasks.has(dep)).length);
+  }
+
+  // 実行可能なタスクを行番号の降順で保持し、末尾（文書内で最も前のタスク）から取り出す
+  const ready = [...graph.tasks.values()]
+    .filter((task) => indegree.get(task.id) === 0)
+    .reverse();
+  const order: Task[] = [];
+
+  while (ready.length > 0) {
+    const task = ready.pop()!;
+    order.push(task);
+    for (const id of graph.dependents.get(task.id) ?? []) {
+      const remaining = indegree.get(id)! - 1;
+      indegree.set(id, remaining);
+      if (remaining === 0) {
+        insertByLine(ready, graph.tasks.get(id)!);
+      }
+    }
+  }
+
+  if (order.length < graph.tasks.size) {
+    const cyclic = [...indegree].filter(([, n]) => n > 0).map(([id]) => id);
+    throw new Error(`Dependency cycle between tasks: ${cyclic.join(", ")}`);
+  }
+
+  return order;
+}
+
+/**
+ * Pending tasks whose dependencies are all completed, in topological order
+ */
+export function nextUnblockedTasks(graph: TaskGraph, limit = Infinity): Task[] {
+  const isDone = (id: string) => {
+    const dep = graph.tasks.get(id);
+    return !dep || dep.status === "completed";
+  };
+
+  return topologicalOrder(graph)
+    .filter((task) => task.status === "pending" && task.dependsOn.every(isDone))
+    .slice(0, limit);
+}
+
+export function summarizeTasks(graph: TaskGraph): TaskSummary {
+  const empty = (name: string): CategorySummary => ({
+    name,
+    total: 0,
+    completed: 0,
+    inProgress: 0,
+    pending: 0,
+  });
+  const byCategory = new Map(graph.categories.map((name) => [name, empty(name)]));
+  const total = empty("Total");
+
+  for (const task of graph.tasks.values()) {
+    for (const summary of [byCategory.get(task.category)!, total]) {
+      summary.total++;
+      if (task.status === "completed") summary.completed++;
+      else if (task.status === "in_progress") summary.inProgress++;
+      else summary.pending++;
+    }
+  }
+
+  return { categories: [...byCategory.values()], total };
+}
+
+export function renderSummaryTable(summary: TaskSummary): string {
+  const rows = [
+    "| Category | Total | Completed | In Progress | Pending |",
+    "|----------|-------|-----------|-------------|---------|",
+    ...summary.categories.map(
+      (c) => `| ${c.name || "Uncategorized"} | ${c.total} | ${c.completed} | ${c.inProgress} | ${c.pending} |`
+    ),
+  ];
+  const t = summary.total;
+  rows.push(`| **Total** | **${t.total}** | **${t.completed}** | **${t.inProgress}** | **${t.pending}** |`);
+  return rows.join("\n");
+}
+
+export function renderProgress(summary: TaskSummary): string {
+  const t = summary.total;
+  const ratio = t.total > 0 ? t.completed / t.total : 0;
+  const filled = Math.round(ratio * BAR_WIDTH);
+
+  return [
+    "```",
+    `✅ Completed: ${t.completed} | 🔄 In Progress: ${t.inProgress} | 🔲 Pending: ${t.pending}`,
+    `${"█".repeat(filled)}${"░".repeat(BAR_WIDTH - filled)}  ${Math.round(ratio * 100)}%`,
+    "```",
+  ].join("\n");
+}
+
+/**
+ * Replace the body of a "## <title>" section, keeping the rest of the file as is
+ * Headings and rules inside fenced code blocks do not end the section.
+ */
+function replaceSection(lines: string[], title: string, body: string): string[] {
+  const fenced = fencedLines(lines);
+  const start = lines.findIndex(
+    (line, i) => !fenced[i] && SECTION_HEADING.exec(line)?.[1] === title
+  );
+  if (start < 0) {
+    return lines;
+  }
+
+  let end = start + 1;
+  while (
+    end < lines.length &&
+    (fenced[end] || (!/^#{1,2}\s/.test(lines[end]) && lines[end] !== "---"))
+  ) {
+    end++;
+  }
+
+  return [...lines.slice(0, start + 1), "", ...body.split("\n"), "", ...lines.slice(end)];
+}
+
+/**
+ * Recompute the Summary table and Progress bar of TASKS.md content
+ */
+export function updateTasksContent(content: string, graph = parseTasks(content)): string {
+  const summary = summarizeTasks(graph);
+  const newline = content.includes("\r\n") ? "\r\n" : "\n";
+
+  let lines = content.split(/\r?\n/);
+  lines = replaceSection(lines, "Summary", renderSummaryTable(summary));
+  lines = replaceSection(lines, "Progress", renderProgress(summary));
+  return lines.join(newline);
+}
+
+/**
+ * Update the Summary/Progress sections of a TASKS.md file in place
+ * The file is only written when a section actually changed.
+ */
+export function updateTasksFile(path: string): { changed: boolean; graph: TaskGraph } {
+  const content = readFileSync(path, "utf-8");
+  const graph = parseTasks(content);
+  const updated = updateTasksContent(content, graph);
+
+  if (updated !== content) {
+    writeFileSync(path, updated);
+  }
+  return { changed: updated !== content, graph };
+}
@@ -0,0 +1,252 @@
+/**
+ * Opt-in instrumentation for install and analysis (--trace / SPEC2IMPL_TRACE)
+ *
+ * Phases are wall-clock spans and file system calls are counted by kind.
+ * Metrics can be exported as Chrome trace-event JSON (chrome://tracing, Perfetto).
+ */
+
+export type SyscallKind = "readdir" | "stat" | "exists" | "read" | "write" | "mkdir" | "copy";
+
+const SYSCALL_KINDS: readonly SyscallKind[] = [
+  "readdir",
+  "stat",
+  "exists",
+  "read",
+  "write",
+  "mkdir",
+  "copy",
+];
+
+export const INSTALL_PHASES = ["templateScan", "targetProbe", "copy", "report"] as const;
+export type InstallPhase = (typeof INSTALL_PHASES)[number];
+
+export const ANALYZE_PHASES = ["cacheRead", "scan", "parse", "cacheWrite"] as const;
+export type AnalyzePhase = (typeof ANALYZE_PHASES)[number];
+
+/**
+ * Chrome trace event ("X" = complete event, "M" = thread name metadata)
+ */
+export interface TraceEvent {
+  name: string;
+  cat?: string;
+  ph: "X" | "M";
+  /** Start time in microseconds */
+  ts: number;
+  /** Duration in microseconds */
+  dur?: number;
+  pid: number;
+  tid: number;
+  args?: Record<string, unknown>;
+}
+
+export interface TraceMetrics<P extends string = string> {
+  /** Wall time per phase in milliseconds */
+  phases: Record<P, number>;
+  /** File system calls by kind */
+  syscalls: Record<SyscallKind, number>;
+  /** Wall time from the first traced phase to the end, in milliseconds */
+  totalMs: number;
+  events: TraceEvent[];
+  /**
+   * Work shared by several runs (installMany's template scan), reported
+   * once here and not included in the counters above
+   */
+  shared?: TraceMetrics<P>;
+}
+
+export interface InstallMetrics extends TraceMetrics<InstallPhase> {
+  filesCopied: number;
+  bytesCopied: number;
+  /** Files copied per second of the copy phase */
+  filesPerSecond: number;
+}
+
+export interface AnalyzeMetrics extends TraceMetrics<AnalyzePhase> {
+  filesParsed: number;
+  /** Bytes read from spec files that were not served from the cache */
+  bytesRead: number;
+}
+
+/**
+ * Counts file system calls; threaded through code that does I/O
+ */
+export interface IoCounter {
+  count(kind: SyscallKind, n?: number): void;
+}
+
+const micros = (ms: number) => Math.round(ms * 1000);
+
+export class Tracer<P extends string = string> implements IoCounter {
+  /** Bytes copied (install) or read (analysis) */
+  bytes = 0;
+  private readonly phases: Record<P, number>;
+  private readonly syscalls = Object.fromEntries(
+    SYSCALL_KINDS.map((kind) => [kind, 0])
+  ) as Record<SyscallKind, number>;
+  private readonly events: TraceEvent[] = [];
+  private readonly start = performance.now();
+
+  constructor(
+    phases: readonly P[],
+    private readonly category: string,
+    label: string,
+    private readonly tid = 1
+  ) {
+    this.phases = Object.fromEntries(phases.map((phase) => [phase, 0])) as Record<P, number>;
+    this.events.push({
+      name: "thread_name",
+      ph: "M",
+      ts: 0,
+      pid: process.pid,
+      tid,
+      args: { name: label },
+    });
+  }
+
+  count(kind: SyscallKind, n = 1): void {
+    this.syscalls[kind] += n;
+  }
+
+  span<T>(phase: P, fn: () => T): T {
+    const start = performance.now();
+    try {
+      return fn();
+    } finally {
+      this.record(phase, start);
+    }
+  }
+
+  async spanAsync<T>(phase: P, fn: () => Promise<T>): Promise<T> {
+    const start = performance.now();
+    try {
+      return await fn();
+    } finally {
+      this.record(phase, start);
+    }
+  }
+
+  metrics(): TraceMetrics<P> {
+    return {
+      phases: { ...this.phases },
+      syscalls: { ...this.syscalls },
+      totalMs: performance.now() - this.start,
+      events: [...this.events],
+    };
+  }
+
+  private record(phase: P, start: number) {
+    const duration = performance.now() - start;
+    this.phases[phase] += duration;
+    this.events.push({
+      name: phase,
+      cat: this.category,
+      ph: "X",
+      ts: micros(start),
+      dur: micros(duration),
+      pid: process.pid,
+      tid: this.tid,
+    });
+  }
+}
+
+/**
+ * Tracing is on when requested explicitly, or via SPEC2IMPL_TRACE
+ */
+export function traceEnabled(option?: boolean): boolean {
+  if (option !== undefined) {
+    return option;
+  }
+  const env = process.env.SPEC2IMPL_TRACE;
+  return env !== undefined && env !== "" && env !== "0" && env !== "false";
+}
+
+export function span<P extends string, T>(
+  trace: Tracer<P> | undefined,
+  phase: P,
+  fn: () => T
+): T {
+  return trace ? trace.span(phase, fn) : fn();
+}
+
+export function spanAsync<P extends string, T>(
+  trace: Tracer<P> | undefined,
+  phase: P,
+  fn: () => Promise<T>
+): Promise<T> {
+  return trace ? trace.spanAsync(phase, fn) : fn();
+}
+
+export function installMetrics(
+  trace: Tracer<InstallPhase>,
+  shared?: TraceMetrics<InstallPhase>
+): InstallMetrics {
+  const metrics = trace.metrics();
+  const filesCopied = metrics.syscalls.copy;
+  return {
+    ...metrics,
+    ...(shared && { shared }),
+    filesCopied,
+    bytesCopied: trace.bytes,
+    filesPerSecond: metrics.phases.copy > 0 ? (filesCopied * 1000) / metrics.phases.copy : 0,
+  };
+}
+
+/**
+ * Totals for several install runs (installMany), for a single summary
+ * Phases, syscalls and copies are summed, with the shared template scan
+ * counted once. totalMs is the wall time from the first to the last traced
+ * phase, and filesPerSecond is measured against it.
+ */
+export function combineInstallMetrics(runs: InstallMetrics[]): InstallMetrics {
+  const shared = runs.find((run) => run.shared)?.shared;
+  const all: TraceMetrics<InstallPhase>[] = shared ? [shared, ...runs] : runs;
+
+  const phases = Object.fromEntries(INSTALL_PHASES.map((phase) => [phase, 0])) as Record<
+    InstallPhase,
+    number
+  >;
+  const syscalls = Object.fromEntries(SYSCALL_KINDS.map((kind) => [kind, 0])) as Record<
+    SyscallKind,
+    number
+  >;
+  for (const run of all) {
+    for (const phase of INSTALL_PHASES) phases[phase] += run.phases[phase];
+    for (const kind of SYSCALL_KINDS) syscalls[kind] += run.syscalls[kind];
+  }
+
+  const { traceEvents } = toChromeTrace(runs);
+  const spans = traceEvents.filter((event) => event.ph === "X");
+  const totalMs =
+    spans.length > 0
+      ? (Math.max(...spans.map((event) => event.ts + event.dur!)) -
+          Math.min(...spans.map((event) => event.ts))) /
+        1000
+      : 0;
+  const filesCopied = runs.reduce((sum, run) => sum + run.filesCopied, 0);
+
+  return {
+    phases,
+    syscalls,
+    totalMs,
+    events: traceEvents,
+    filesCopied,
+    bytesCopied: runs.reduce((sum, run) => sum + run.bytesCopied, 0),
+    filesPerSecond: totalMs > 0 ? (filesCopied * 1000) / totalMs : 0,
+  };
+}
+
+/**
+ * Chrome trace-event JSON for one or more runs
+ * Shared work (installMany's template scan) appears once, on its own track.
+ */
+export function toChromeTrace(metrics: TraceMetrics | TraceMetrics[]): {
+  traceEvents: TraceEvent[];
+  displayTimeUnit: "ms";
+} {
+  const runs = Array.isArray(metrics) ? metrics : [metrics];
+  const events = new Set(runs.flatMap((run) => [...(run.shared?.events ?? []), ...run.events]));
+  return {
+    traceEvents: [...events].sort((a, b) => a.ts - b.ts),
+    displayTimeUnit: "ms",
+  };
+}
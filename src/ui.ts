@@ -0,0 +1,99 @@
+/**
+ * Terminal output helpers for the CLI
+ *
+ * chalk and ora are only imported when stdout is a TTY. Piped / CI output
+ * uses plain text, which is what chalk and ora would produce there anyway.
+ */
+
+type Style = (text: string) => string;
+
+export interface Colors {
+  red: Style;
+  green: Style;
+  cyan: Style;
+  yellow: Style;
+  dim: Style;
+  bold: Style;
+  boldWhite: Style;
+}
+
+export interface Spinner {
+  text: string;
+  start(): Spinner;
+  stop(): Spinner;
+  succeed(text?: string): Spinner;
+  fail(text?: string): Spinner;
+  info(text?: string): Spinner;
+}
+
+export interface Ui {
+  colors: Colors;
+  spinner(text: string): Spinner;
+}
+
+const plain: Style = (text) => text;
+
+const plainColors: Colors = {
+  red: plain,
+  green: plain,
+  cyan: plain,
+  yellow: plain,
+  dim: plain,
+  bold: plain,
+  boldWhite: plain,
+};
+
+/**
+ * ora と同じく、結果行はすべて stderr に出力（stdout は --json などの出力用）
+ */
+function plainSpinner(text: string): Spinner {
+  const spinner: Spinner = {
+    text,
+    start: () => spinner,
+    stop: () => spinner,
+    succeed(t = spinner.text) {
+      process.stderr.write(`✔ ${t}\n`);
+      return spinner;
+    },
+    fail(t = spinner.text) {
+      process.stderr.write(`✖ ${t}\n`);
+      return spinner;
+    },
+    info(t = spinner.text) {
+      process.stderr.write(`ℹ ${t}\n`);
+      return spinner;
+    },
+  };
+  return spinner;
+}
+
+let cached: Promise<Ui> | undefined;
+
+export function loadUi(): Promise<Ui> {
+  cached ??= createUi();
+  return cached;
+}
+
+async function createUi(): Promise<Ui> {
+  if (!process.stdout.isTTY) {
+    return { colors: plainColors, spinner: plainSpinner };
+  }
+
+  const [{ default: chalk }, { default: ora }] = await Promise.all([
+    import("chalk"),
+    import("ora"),
+  ]);
+
+  return {
+    colors: {
+      red: chalk.red,
+      green: chalk.green,
+      cyan: chalk.cyan,
+      yellow: chalk.yellow,
+      dim: chalk.dim,
+      bold: chalk.bold,
+      boldWhite: chalk.bold.white,
+    },
+    spinner: (text) => ora(text),
+  };
+}
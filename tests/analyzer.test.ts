@@ -0,0 +1,191 @@
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import { mkdirSync, mkdtempSync, readFileSync, rmSync, unlinkSync, writeFileSync } from "fs";
+import { tmpdir } from "os";
+import { dirname, join } from "path";
+import { fileURLToPath } from "url";
+import { ANALYSIS_CACHE_FILE, analyzeSpecs, parseMarkdownSpec } from "../src/analyzer/index.js";
+
+const EXAMPLE = join(dirname(fileURLToPath(import.meta.url)), "..", "examples", "user-api.md");
+
+describe("parseMarkdownSpec", () => {
+  const analysis = parseMarkdownSpec(readFileSync(EXAMPLE, "utf-8"), "examples/user-api.md", "user-api");
+
+  it("extracts the title and tech stack", () => {
+    expect(analysis.meta).toEqual({
+      title: "User Management API 仕様書",
+      domain: "user-api",
+      source: "examples/user-api.md",
+    });
+    expect(analysis.techStack).toEqual({
+      frameworks: ["Express.js", "TypeScript"],
+      databases: ["PostgreSQL"],
+      services: ["JWT"],
+    });
+  });
+
+  it("extracts API endpoints with parameters and the first response", () => {
+    expect(analysis.apis.map((api) => api.name)).toEqual([
+      "POST /api/users",
+      "GET /api/users/:id",
+      "GET /api/users",
+      "PUT /api/users/:id",
+      "DELETE /api/users/:id",
+    ]);
+
+    const [create, , list] = analysis.apis;
+    expect(create.method).toBe("POST");
+    expect(create.endpoint).toBe("/api/users");
+    expect(create.parameters.map((p) => p.name)).toEqual(["email", "name", "password"]);
+    expect(create.response).toEqual({ type: "201 Created", description: "ユーザー作成成功" });
+    expect(list.parameters.map((p) => [p.name, p.required])).toEqual([
+      ["page", false],
+      ["limit", false],
+      ["role", false],
+    ]);
+  });
+
+  it("extracts model fields", () => {
+    const [user, profile] = analysis.models;
+
+    expect(user.name).toBe("User");
+    expect(user.fields.map((f) => f.name)).toEqual([
+      "id",
+      "email",
+      "name",
+      "password",
+      "role",
+      "createdAt",
+      "updatedAt",
+    ]);
+    expect(user.fields[0]).toMatchObject({ type: "string (UUID)", required: true });
+
+    expect(profile.name).toBe("UserProfile");
+    expect(profile.fields.map((f) => [f.name, f.required])).toEqual([
+      ["userId", true],
+      ["avatar", false],
+      ["bio", false],
+      ["website", false],
+    ]);
+  });
+
+  it("classifies constraints by section", () => {
+    expect(analysis.constraints.map((c) => c.type)).toEqual([
+      ...Array(5).fill("validation"),
+      ...Array(3).fill("business_rule"),
+      ...Array(3).fill("security"),
+    ]);
+  });
+
+  it("extracts workflows and checklists", () => {
+    expect(analysis.workflows.map((w) => [w.name, w.steps.length])).toEqual([
+      ["ユーザー登録フロー", 6],
+      ["パスワードリセットフロー", 5],
+    ]);
+    expect(analysis.workflows[0].steps[0]).toBe("クライアントがPOST /api/usersにリクエスト");
+
+    expect(analysis.checklists.map((c) => [c.name, c.items.length])).toEqual([
+      ["Implementation Checklist", 12],
+      ["Verification Checklist", 7],
+    ]);
+    expect(analysis.checklists[0].items[0]).toEqual({ text: "User モデルの実装", checked: false });
+  });
+});
+
+describe("API headings", () => {
+  it("only treats an upper-case method followed by a path as an endpoint", () => {
+    const analysis = parseMarkdownSpec(
+      [
+        "# Guide",
+        "## Get started",
+        "| Field | Type |",
+        "|-------|------|",
+        "| id | string |",
+        "## Delete account flow",
+        "## Options for deployment",
+        "## GET /users/{id} - Fetch a user",
+        "## DELETE {id}",
+        "## PATCH :id",
+      ].join("\n"),
+      "guide.md",
+      "guide"
+    );
+
+    expect(analysis.apis.map((api) => api.name)).toEqual([
+      "GET /users/{id}",
+      "DELETE {id}",
+      "PATCH :id",
+    ]);
+    expect(analysis.models.map((model) => [model.name, model.fields.length])).toEqual([
+      ["Get started", 1],
+    ]);
+  });
+});
+
+describe("analyzeSpecs", () => {
+  let root: string;
+
+  function write(path: string, content: string) {
+    mkdirSync(dirname(join(root, path)), { recursive: true });
+    writeFileSync(join(root, path), content);
+  }
+
+  function cachedSources(): string[] {
+    const cache = JSON.parse(readFileSync(join(root, ".claude", ANALYSIS_CACHE_FILE), "utf-8"));
+    return Object.keys(cache.files).sort();
+  }
+
+  beforeEach(() => {
+    root = mkdtempSync(join(tmpdir(), "spec2impl-analyzer-"));
+    write("docs/a.md", "# A\n\n#### GET /a\n");
+    write("docs/b.md", "# B\n\n#### GET /b\n");
+  });
+
+  afterEach(() => {
+    rmSync(root, { recursive: true, force: true });
+  });
+
+  it("parses on a miss and reuses the cache on a hit", () => {
+    const first = analyzeSpecs("docs", { projectRoot: root });
+    expect(first.parsed).toEqual(["docs/a.md", "docs/b.md"]);
+    expect(first.cached).toEqual([]);
+
+    const second = analyzeSpecs("docs", { projectRoot: root });
+    expect(second.parsed).toEqual([]);
+    expect(second.cached).toEqual(["docs/a.md", "docs/b.md"]);
+    expect(second.merged.apis.map((api) => api.name)).toEqual(["GET /a", "GET /b"]);
+  });
+
+  it("re-parses only files whose content changed", () => {
+    analyzeSpecs("docs", { projectRoot: root });
+    write("docs/a.md", "# A\n\n#### POST /a\n");
+
+    const result = analyzeSpecs("docs", { projectRoot: root });
+    expect(result.parsed).toEqual(["docs/a.md"]);
+    expect(result.cached).toEqual(["docs/b.md"]);
+    expect(result.merged.apis.map((api) => api.name)).toEqual(["POST /a", "GET /b"]);
+  });
+
+  it("drops cache entries for deleted specs in scope only", () => {
+    write("other/c.md", "# C\n");
+    analyzeSpecs("docs", { projectRoot: root });
+    analyzeSpecs("other", { projectRoot: root });
+    unlinkSync(join(root, "docs/b.md"));
+
+    analyzeSpecs("docs", { projectRoot: root });
+    expect(cachedSources()).toEqual(["docs/a.md", "other/c.md"]);
+  });
+
+  it("skips dot-directories and node_modules", () => {
+    write("docs/.drafts/d.md", "# D\n");
+    write("docs/node_modules/pkg/README.md", "# Pkg\n");
+
+    expect(analyzeSpecs("docs", { projectRoot: root }).parsed).toEqual(["docs/a.md", "docs/b.md"]);
+  });
+
+  it("leaves the cache alone when disabled", () => {
+    const result = analyzeSpecs("docs", { projectRoot: root, cache: false });
+
+    expect(result.parsed).toHaveLength(2);
+    expect(() => cachedSources()).toThrow();
+  });
+});
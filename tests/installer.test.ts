@@ -0,0 +1,107 @@
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import { existsSync, mkdirSync, mkdtempSync, rmSync, writeFileSync } from "fs";
+import { tmpdir } from "os";
+import { dirname, join } from "path";
+import { fileURLToPath } from "url";
+import {
+  createInstallPlansWithMetrics,
+  installMany,
+  type TargetInstallResult,
+} from "../src/installer.js";
+
+const TEMPLATES_DIR = join(dirname(fileURLToPath(import.meta.url)), "..", "templates");
+const hasTemplates = existsSync(TEMPLATES_DIR);
+
+let root: string;
+
+function targets(count: number): string[] {
+  return Array.from({ length: count }, (_, i) => {
+    const dir = join(root, `project-${i}`);
+    mkdirSync(dir);
+    return dir;
+  });
+}
+
+async function collect(iterable: AsyncIterable<TargetInstallResult>): Promise<TargetInstallResult[]> {
+  const results: TargetInstallResult[] = [];
+  for await (const result of iterable) {
+    results.push(result);
+  }
+  return results;
+}
+
+beforeEach(() => {
+  root = mkdtempSync(join(tmpdir(), "spec2impl-install-"));
+});
+
+afterEach(() => {
+  rmSync(root, { recursive: true, force: true });
+});
+
+describe("installMany", () => {
+  it.skipIf(!hasTemplates)("installs into every target with one shared template scan", async () => {
+    const dirs = targets(5);
+    const results = await collect(installMany(dirs, { concurrency: 2, trace: true }));
+
+    expect(results.map((result) => result.target).sort()).toEqual(dirs);
+    expect(results.every((result) => result.success && result.copied.length > 0)).toBe(true);
+
+    const shared = results[0].metrics!.shared!;
+    expect(shared.phases.templateScan).toBeGreaterThan(0);
+    for (const result of results) {
+      expect(result.metrics!.shared).toBe(shared);
+      expect(result.metrics!.phases.templateScan).toBe(0);
+    }
+  });
+
+  it.skipIf(!hasTemplates)("keeps at most `concurrency` targets in flight", async () => {
+    const dirs = targets(6);
+    const iterator = installMany(dirs, { concurrency: 2 });
+
+    // 最初の結果の時点で着手済みなのは完了した 1 件と実行中の 2 件まで
+    await iterator.next();
+    const started = dirs.filter((dir) => existsSync(join(dir, ".claude")));
+    expect(started.length).toBeLessThan(4);
+
+    const rest = await collect({ [Symbol.asyncIterator]: () => iterator });
+    expect(rest).toHaveLength(5);
+  });
+
+  it.skipIf(!hasTemplates)("reports a failing target without aborting the others", async () => {
+    const [first, second] = targets(2);
+    const blocked = join(root, "blocked");
+    writeFileSync(blocked, "not a directory");
+
+    const results = await collect(installMany([first, blocked, second], { concurrency: 1 }));
+    const byTarget = Object.fromEntries(results.map((result) => [result.target, result]));
+
+    expect(byTarget[blocked].success).toBe(false);
+    expect(byTarget[blocked].error).toBeDefined();
+    expect(byTarget[first].success).toBe(true);
+    expect(byTarget[second].success).toBe(true);
+  });
+
+  it.skipIf(!hasTemplates)("treats a non-finite concurrency as the default", async () => {
+    const dirs = targets(3);
+
+    expect(await collect(installMany(dirs, { concurrency: NaN, jobs: NaN }))).toHaveLength(3);
+    expect(await collect(installMany(targets(0), { concurrency: 0 }))).toEqual([]);
+  });
+});
+
+describe("createInstallPlansWithMetrics", () => {
+  it.skipIf(!hasTemplates)("traces the dry-run scan and probes without writing", () => {
+    const dirs = targets(2);
+    const { plans, metrics } = createInstallPlansWithMetrics(dirs, { trace: true });
+
+    expect(plans.map((plan) => plan.target)).toEqual(dirs);
+    expect(metrics).toHaveLength(2);
+    expect(metrics![0].shared).toBe(metrics![1].shared);
+    expect(metrics![0].phases.targetProbe).toBeGreaterThan(0);
+    expect(dirs.some((dir) => existsSync(join(dir, ".claude")))).toBe(false);
+  });
+
+  it.skipIf(!hasTemplates)("returns no metrics when tracing is off", () => {
+    expect(createInstallPlansWithMetrics(targets(1), { trace: false }).metrics).toBeUndefined();
+  });
+});
@@ -0,0 +1,95 @@
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import { mkdirSync, mkdtempSync, rmSync, unlinkSync, utimesSync, writeFileSync } from "fs";
+import { tmpdir } from "os";
+import { dirname, join } from "path";
+import { MANIFEST_FILE, buildManifest, loadManifest, writeManifest } from "../src/manifest.js";
+import type { IoCounter } from "../src/trace.js";
+
+let root: string;
+let templateDir: string;
+let manifestPath: string;
+
+function write(path: string, content: string) {
+  mkdirSync(dirname(join(templateDir, path)), { recursive: true });
+  writeFileSync(join(templateDir, path), content);
+}
+
+// テンプレートより新しいマニフェストを書き出す
+function writeFreshManifest() {
+  const manifest = buildManifest(templateDir);
+  writeManifest(manifestPath, { ...manifest, hash: "precomputed" });
+  const future = new Date(Date.now() + 60_000);
+  utimesSync(manifestPath, future, future);
+}
+
+beforeEach(() => {
+  root = mkdtempSync(join(tmpdir(), "spec2impl-manifest-"));
+  templateDir = join(root, ".claude");
+  manifestPath = join(root, MANIFEST_FILE);
+  write("commands/spec2impl.md", "command");
+  write("agents/spec2impl/spec-analyzer.md", "agent");
+});
+
+afterEach(() => {
+  rmSync(root, { recursive: true, force: true });
+});
+
+describe("buildManifest", () => {
+  it("lists files with sorted relative paths", () => {
+    const manifest = buildManifest(templateDir);
+
+    expect(manifest.entries.map((entry) => entry.path)).toEqual([
+      "agents/spec2impl/spec-analyzer.md",
+      "commands/spec2impl.md",
+    ]);
+    expect(manifest.entries[1].size).toBe("command".length);
+  });
+});
+
+describe("loadManifest", () => {
+  it("uses the precomputed manifest when it matches the template tree", () => {
+    writeFreshManifest();
+
+    expect(loadManifest(manifestPath, templateDir, undefined, true).hash).toBe("precomputed");
+  });
+
+  it("trusts the manifest without walking the tree unless verifying", () => {
+    writeFreshManifest();
+    write("commands/new.md", "new");
+    const counts: string[] = [];
+    const io: IoCounter = { count: (kind) => void counts.push(kind) };
+
+    expect(loadManifest(manifestPath, templateDir, io).hash).toBe("precomputed");
+    expect(counts).toEqual(["stat", "read"]);
+  });
+
+  it("rescans when the manifest is missing", () => {
+    expect(loadManifest(manifestPath, templateDir, undefined, true).hash).toBe(buildManifest(templateDir).hash);
+  });
+
+  it("rescans when a template file was added", () => {
+    writeFreshManifest();
+    write("commands/new.md", "new");
+
+    const manifest = loadManifest(manifestPath, templateDir, undefined, true);
+    expect(manifest.entries.map((entry) => entry.path)).toContain("commands/new.md");
+  });
+
+  it("rescans when a template file was deleted", () => {
+    writeFreshManifest();
+    unlinkSync(join(templateDir, "commands/spec2impl.md"));
+
+    const manifest = loadManifest(manifestPath, templateDir, undefined, true);
+    expect(manifest.entries.map((entry) => entry.path)).toEqual([
+      "agents/spec2impl/spec-analyzer.md",
+    ]);
+  });
+
+  it("rescans when a template file is newer than the manifest", () => {
+    writeFreshManifest();
+    const later = new Date(Date.now() + 120_000);
+    utimesSync(join(templateDir, "commands/spec2impl.md"), later, later);
+
+    expect(loadManifest(manifestPath, templateDir, undefined, true).hash).not.toBe("precomputed");
+  });
+});
@@ -0,0 +1,147 @@
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import { existsSync, mkdirSync, mkdtempSync, readdirSync, rmSync, writeFileSync } from "fs";
+import { tmpdir } from "os";
+import { dirname, join } from "path";
+import { fileURLToPath } from "url";
+import { install } from "../src/installer.js";
+import {
+  STATE_FILE,
+  buildManifest,
+  tryStat,
+  writeInstallState,
+  type TemplateManifest,
+} from "../src/manifest.js";
+import {
+  planInstall,
+  planToJSON,
+  stateAfter,
+  type FileStamp,
+  type InstallPlan,
+} from "../src/plan.js";
+
+const TEMPLATES_DIR = join(dirname(fileURLToPath(import.meta.url)), "..", "templates");
+
+let root: string;
+let templateDir: string;
+let targetDir: string;
+let manifest: TemplateManifest;
+
+function write(base: string, path: string, content: string) {
+  mkdirSync(dirname(join(base, path)), { recursive: true });
+  writeFileSync(join(base, path), content);
+}
+
+function actions(plan: InstallPlan): Record<string, string> {
+  return Object.fromEntries(plan.files.map((file) => [file.path, file.action]));
+}
+
+// テンプレートをそのままコピーしたことにして状態ファイルを記録
+function recordInstall(plan: InstallPlan) {
+  const claudeDir = join(plan.target, ".claude");
+  const written = new Map<string, FileStamp>();
+  for (const file of plan.files) {
+    write(claudeDir, file.path, `template ${file.path}`);
+    const { size, mtimeMs } = tryStat(join(claudeDir, file.path))!;
+    written.set(file.path, { size, mtimeMs });
+  }
+  writeInstallState(join(claudeDir, STATE_FILE), stateAfter(plan, written)!);
+}
+
+beforeEach(() => {
+  root = mkdtempSync(join(tmpdir(), "spec2impl-plan-"));
+  templateDir = join(root, "templates");
+  targetDir = join(root, "project");
+  mkdirSync(targetDir);
+
+  // 管理ファイル（commands/spec2impl.md）とユーザーファイル（commands/review.md）
+  write(templateDir, "commands/spec2impl.md", "template commands/spec2impl.md");
+  write(templateDir, "commands/review.md", "template commands/review.md");
+  manifest = buildManifest(templateDir);
+});
+
+afterEach(() => {
+  rmSync(root, { recursive: true, force: true });
+});
+
+describe("planInstall", () => {
+  it("writes nothing to the target", () => {
+    const plan = planInstall(manifest, targetDir);
+
+    expect(readdirSync(targetDir)).toEqual([]);
+    expect(Object.isFrozen(plan)).toBe(true);
+    expect(Object.isFrozen(plan.files[0])).toBe(true);
+  });
+
+  it("copies files that do not exist yet", () => {
+    expect(actions(planInstall(manifest, targetDir))).toEqual({
+      "commands/review.md": "copy",
+      "commands/spec2impl.md": "copy",
+    });
+  });
+
+  it("updates managed files and skips user files that differ", () => {
+    write(join(targetDir, ".claude"), "commands/spec2impl.md", "old");
+    write(join(targetDir, ".claude"), "commands/review.md", "edited by user");
+
+    expect(actions(planInstall(manifest, targetDir))).toEqual({
+      "commands/review.md": "skip",
+      "commands/spec2impl.md": "update",
+    });
+  });
+
+  it("overwrites user files with force", () => {
+    write(join(targetDir, ".claude"), "commands/review.md", "edited by user");
+
+    expect(actions(planInstall(manifest, targetDir, true))).toMatchObject({
+      "commands/review.md": "overwrite",
+    });
+  });
+
+  it("reports files matching the recorded install as unchanged", () => {
+    recordInstall(planInstall(manifest, targetDir));
+
+    const plan = planInstall(manifest, targetDir);
+    expect(actions(plan)).toEqual({
+      "commands/review.md": "unchanged",
+      "commands/spec2impl.md": "unchanged",
+    });
+    expect(plan.recordedManifestHash).toBe(manifest.hash);
+    expect(stateAfter(plan, new Map())).toBeUndefined();
+  });
+
+  it("skips a user file edited after the recorded install", () => {
+    recordInstall(planInstall(manifest, targetDir));
+    write(join(targetDir, ".claude"), "commands/review.md", "edited after install");
+
+    expect(actions(planInstall(manifest, targetDir))).toEqual({
+      "commands/review.md": "skip",
+      "commands/spec2impl.md": "unchanged",
+    });
+  });
+});
+
+describe("planToJSON", () => {
+  it("uses a relative target and leaves out stat details", () => {
+    write(join(targetDir, ".claude"), "commands/review.md", "edited by user");
+    const json = planToJSON(planInstall(manifest, targetDir), root);
+
+    expect(json.target).toBe("project");
+    expect(json.files[0]).toEqual({
+      path: "commands/review.md",
+      action: "skip",
+      size: manifest.entries[0].size,
+      hash: manifest.entries[0].hash,
+    });
+    expect(JSON.stringify(json)).not.toContain("mtimeMs");
+  });
+});
+
+describe("install dryRun", () => {
+  it.skipIf(!existsSync(TEMPLATES_DIR))("does not create any file", () => {
+    const result = install(targetDir, { dryRun: true });
+
+    expect(result.success).toBe(true);
+    expect(result.copied.length).toBeGreaterThan(0);
+    expect(readdirSync(targetDir)).toEqual([]);
+  });
+});
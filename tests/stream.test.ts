@@ -0,0 +1,121 @@
+import { afterAll, beforeAll, describe, expect, it } from "vitest";
+import { mkdtempSync, readFileSync, rmSync, writeFileSync } from "fs";
+import { tmpdir } from "os";
+import { dirname, join } from "path";
+import { fileURLToPath } from "url";
+import {
+  analyzeSpecFiles,
+  readLines,
+  streamSpecRecords,
+  streamSpecRecordsParallel,
+} from "../src/analyzer/stream.js";
+import {
+  applyRecord,
+  domainOf,
+  emptyAnalysis,
+  parseMarkdownSpec,
+} from "../src/analyzer/markdown-parser.js";
+import type { SpecRecord } from "../src/analyzer/types.js";
+
+const EXAMPLE = join(dirname(fileURLToPath(import.meta.url)), "..", "examples", "user-api.md");
+
+let root: string;
+let large: string;
+let largeContent: string;
+
+// createReadStream の既定チャンク（64 KB）を何度もまたぐ CRLF の仕様書
+function largeSpec(): string {
+  const lines = readFileSync(EXAMPLE, "utf-8").split(/\r?\n/);
+  for (let i = 0; i < 1500; i++) {
+    lines.push(
+      `### GET /items/${i}`,
+      "",
+      `アイテム ${i} を取得します。`,
+      "",
+      "| Field | Type | Required | Description |",
+      "|-------|------|----------|-------------|",
+      `| id${i} | string | Yes | 識別子 ${i} |`,
+      ""
+    );
+  }
+  return lines.join("\r\n");
+}
+
+function fold(source: string, records: SpecRecord[]) {
+  const analysis = emptyAnalysis(source, domainOf(source));
+  for (const record of records) {
+    applyRecord(analysis, record);
+  }
+  return analysis;
+}
+
+async function collect<T>(iterable: AsyncIterable<T>): Promise<T[]> {
+  const items: T[] = [];
+  for await (const item of iterable) {
+    items.push(item);
+  }
+  return items;
+}
+
+beforeAll(() => {
+  root = mkdtempSync(join(tmpdir(), "spec2impl-stream-"));
+  large = join(root, "large.md");
+  largeContent = largeSpec();
+  writeFileSync(large, largeContent);
+});
+
+afterAll(() => {
+  rmSync(root, { recursive: true, force: true });
+});
+
+describe("readLines", () => {
+  it("splits CRLF lines across chunk boundaries", async () => {
+    expect(Buffer.byteLength(largeContent)).toBeGreaterThan(4 * 64 * 1024);
+
+    // 末尾の CRLF の後ろに空行はない
+    expect(await collect(readLines(large))).toEqual(largeContent.split("\r\n").slice(0, -1));
+  });
+
+  it("keeps a last line without a newline and drops a final empty line", async () => {
+    const file = join(root, "lines.md");
+    writeFileSync(file, "a\r\nb\n\nc");
+    expect(await collect(readLines(file))).toEqual(["a", "b", "", "c"]);
+
+    writeFileSync(file, "a\r\n");
+    expect(await collect(readLines(file))).toEqual(["a"]);
+  });
+});
+
+describe("streamSpecRecords", () => {
+  it("yields the same analysis as parseMarkdownSpec", async () => {
+    const records = await collect(streamSpecRecords(large));
+    const expected = parseMarkdownSpec(largeContent, large, domainOf(large));
+
+    expect(fold(large, records)).toEqual(expected);
+    expect(expected.apis).toHaveLength(1505);
+  });
+});
+
+describe("streamSpecRecordsParallel", () => {
+  it("folds worker records into the same analyses, one batch at a time", async () => {
+    const files = [large, EXAMPLE, large];
+    const analyses = await analyzeSpecFiles(files, { workers: 2, batchSize: 1 });
+
+    expect(analyses).toEqual(
+      files.map((file) => parseMarkdownSpec(readFileSync(file, "utf-8"), file, domainOf(file)))
+    );
+  });
+
+  it("keeps the records of each file in order", async () => {
+    const sourced = await collect(streamSpecRecordsParallel([large, EXAMPLE], { batchSize: 7 }));
+    const ofLarge = sourced.filter((item) => item.source === large).map((item) => item.record);
+
+    expect(ofLarge).toEqual(await collect(streamSpecRecords(large)));
+  });
+
+  it("reports the file that failed", async () => {
+    const missing = join(root, "missing.md");
+
+    await expect(analyzeSpecFiles([missing])).rejects.toThrow(missing);
+  });
+});
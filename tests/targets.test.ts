@@ -0,0 +1,64 @@
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import { mkdirSync, mkdtempSync, rmSync, writeFileSync } from "fs";
+import { tmpdir } from "os";
+import { join } from "path";
+import { expandTargets } from "../src/targets.js";
+
+let root: string;
+
+beforeEach(() => {
+  root = mkdtempSync(join(tmpdir(), "spec2impl-targets-"));
+  for (const dir of ["packages/api", "packages/app", "packages/web", "packages/.cache", "apps/a/web"]) {
+    mkdirSync(join(root, dir), { recursive: true });
+  }
+  writeFileSync(join(root, "packages/README.md"), "not a directory");
+});
+
+afterEach(() => {
+  rmSync(root, { recursive: true, force: true });
+});
+
+describe("expandTargets", () => {
+  it("passes plain paths through unchanged", () => {
+    expect(expandTargets(["does/not/exist", "."])).toEqual(["does/not/exist", "."]);
+  });
+
+  it("expands * to sorted directories, skipping dot-directories and files", () => {
+    expect(expandTargets([`${root}/packages/*`])).toEqual([
+      join(root, "packages/api"),
+      join(root, "packages/app"),
+      join(root, "packages/web"),
+    ]);
+  });
+
+  it("expands ? to a single character", () => {
+    expect(expandTargets([`${root}/packages/ap?`])).toEqual([
+      join(root, "packages/api"),
+      join(root, "packages/app"),
+    ]);
+  });
+
+  it("matches wildcards within one segment and continues below them", () => {
+    expect(expandTargets([`${root}/apps/*/web`, `${root}/missing/*`])).toEqual([
+      join(root, "apps/a/web"),
+    ]);
+  });
+
+  it("removes duplicates across patterns", () => {
+    expect(expandTargets([`${root}/packages/a*`, `${root}/packages/ap?`])).toEqual([
+      join(root, "packages/api"),
+      join(root, "packages/app"),
+    ]);
+  });
+
+  it.each(["**/web", "packages/{api,web}", "packages/[aw]*"])("rejects %s", (pattern) => {
+    expect(() => expandTargets([join(root, pattern)])).toThrow("Unsupported glob pattern");
+  });
+
+  it("accepts an existing directory whose name looks like a glob", () => {
+    const dir = join(root, "[draft]");
+    mkdirSync(dir);
+
+    expect(expandTargets([dir])).toEqual([dir]);
+  });
+});
@@ -0,0 +1,175 @@
+import { describe, expect, it } from "vitest";
+import { readFileSync } from "fs";
+import { dirname, join } from "path";
+import { fileURLToPath } from "url";
+import {
+  nextUnblockedTasks,
+  parseTasks,
+  summarizeTasks,
+  topologicalOrder,
+  updateTasksContent,
+} from "../src/tasks.js";
+
+const TASKS_MD = join(dirname(fileURLToPath(import.meta.url)), "..", "docs", "TASKS.md");
+
+const TASKS = `# Implementation Tasks
+
+## Summary
+
+(stale)
+
+## Progress
+
+\`\`\`
+(stale)
+\`\`\`
+
+---
+
+### Phase 1: Spec-Defined
+
+- [x] T-SPEC-001: Read specification
+- [ ] T-SPEC-002: Review constraints
+  - Depends on: T-SPEC-001
+
+### Phase 2: Auto-Detected
+
+- [~] T-AUTO-001: POST /users
+  - Depends on: T-SPEC-001
+- [ ] T-AUTO-002: GET /users/:id
+  - 依存: T-AUTO-001
+- [ ] T-VERIFY-001: Verify API responses 🔄
+- [ ] T-VERIFY-002: Verify constraints
+  - Depends on: T-SPEC-002, T-MISSING-001
+
+\`\`\`
+- [ ] T-DOC-001: example inside a code block
+\`\`\`
+`;
+
+describe("parseTasks", () => {
+  it("indexes IDs, status, categories and dependencies", () => {
+    const graph = parseTasks(TASKS);
+
+    expect([...graph.tasks.keys()]).toEqual([
+      "T-SPEC-001",
+      "T-SPEC-002",
+      "T-AUTO-001",
+      "T-AUTO-002",
+      "T-VERIFY-001",
+      "T-VERIFY-002",
+    ]);
+    expect(graph.categories).toEqual(["Spec-Defined", "Auto-Detected"]);
+
+    const status = (id: string) => graph.tasks.get(id)!.status;
+    expect(status("T-SPEC-001")).toBe("completed");
+    expect(status("T-SPEC-002")).toBe("pending");
+    expect(status("T-AUTO-001")).toBe("in_progress");
+    expect(status("T-VERIFY-001")).toBe("in_progress");
+
+    expect(graph.tasks.get("T-AUTO-002")!.dependsOn).toEqual(["T-AUTO-001"]);
+    expect(graph.tasks.get("T-VERIFY-002")!.dependsOn).toEqual(["T-SPEC-002", "T-MISSING-001"]);
+    expect(graph.dependents.get("T-SPEC-001")).toEqual(["T-SPEC-002", "T-AUTO-001"]);
+  });
+
+  it("reads the repository's own TASKS.md", () => {
+    const summary = summarizeTasks(parseTasks(readFileSync(TASKS_MD, "utf-8")));
+
+    expect(summary.categories.map((c) => [c.name, c.total])).toEqual([
+      ["Core Structure", 4],
+      ["Generator Agents", 5],
+      ["Additional Features", 2],
+      ["Documentation", 2],
+    ]);
+    expect(summary.total.completed).toBe(13);
+  });
+});
+
+describe("nextUnblockedTasks", () => {
+  it("returns pending tasks whose dependencies are completed", () => {
+    const next = nextUnblockedTasks(parseTasks(TASKS));
+
+    // T-AUTO-002 waits for the in-progress T-AUTO-001, T-VERIFY-002 for T-SPEC-002
+    expect(next.map((task) => task.id)).toEqual(["T-SPEC-002"]);
+  });
+
+  it("ignores dependencies that are not in the file", () => {
+    const graph = parseTasks(TASKS.replace("- [ ] T-SPEC-002", "- [x] T-SPEC-002"));
+
+    expect(nextUnblockedTasks(graph).map((task) => task.id)).toEqual(["T-VERIFY-002"]);
+  });
+
+  it("puts earlier unblocked tasks before later tasks without dependencies", () => {
+    const graph = parseTasks(
+      "### A\n- [x] T-A-1: a\n- [ ] T-A-2: b\n  - Depends on: T-A-1\n### B\n- [ ] T-B-1: c\n"
+    );
+
+    expect(nextUnblockedTasks(graph).map((task) => task.id)).toEqual(["T-A-2", "T-B-1"]);
+  });
+
+  it("limits the number of tasks", () => {
+    const graph = parseTasks("### A\n- [ ] T-A-1: a\n- [ ] T-A-2: b\n- [ ] T-A-3: c\n");
+
+    expect(nextUnblockedTasks(graph, 2).map((task) => task.id)).toEqual(["T-A-1", "T-A-2"]);
+  });
+});
+
+describe("topologicalOrder", () => {
+  it("orders dependencies first, ties in document order", () => {
+    const graph = parseTasks(
+      "### A\n- [ ] T-A-1: a\n  - Depends on: T-A-3\n- [ ] T-A-2: b\n- [ ] T-A-3: c\n"
+    );
+
+    expect(topologicalOrder(graph).map((task) => task.id)).toEqual(["T-A-2", "T-A-3", "T-A-1"]);
+  });
+
+  it("takes the earliest ready task rather than breadth-first layers", () => {
+    const graph = parseTasks(
+      "### A\n- [x] T-1: a\n- [ ] T-2: b\n  - Depends on: T-1\n- [ ] T-3: c\n"
+    );
+
+    expect(topologicalOrder(graph).map((task) => task.id)).toEqual(["T-1", "T-2", "T-3"]);
+  });
+
+  it("throws on a dependency cycle", () => {
+    const graph = parseTasks(
+      "### A\n- [ ] T-A-1: a\n  - Depends on: T-A-2\n- [ ] T-A-2: b\n  - Depends on: T-A-1\n"
+    );
+
+    expect(() => topologicalOrder(graph)).toThrow(/T-A-1, T-A-2/);
+  });
+});
+
+describe("updateTasksContent", () => {
+  it("leaves the repository's TASKS.md unchanged", () => {
+    const content = readFileSync(TASKS_MD, "utf-8");
+
+    expect(updateTasksContent(content)).toBe(content);
+  });
+
+  it("rewrites only the Summary and Progress sections", () => {
+    const updated = updateTasksContent(TASKS);
+
+    expect(updated).toContain("| Spec-Defined | 2 | 1 | 0 | 1 |");
+    expect(updated).toContain("| Auto-Detected | 4 | 0 | 2 | 2 |");
+    expect(updated).toContain("| **Total** | **6** | **1** | **2** | **3** |");
+    expect(updated).toContain("✅ Completed: 1 | 🔄 In Progress: 2 | 🔲 Pending: 3");
+    expect(updated).not.toContain("(stale)");
+    expect(updated.slice(updated.indexOf("\n---\n"))).toBe(TASKS.slice(TASKS.indexOf("\n---\n")));
+    expect(updateTasksContent(updated)).toBe(updated);
+  });
+
+  it("does not end a section at a heading inside a code block", () => {
+    const content = TASKS.replace(
+      "(stale)\n\n## Progress",
+      "(stale)\n\n```md\n## Not a section\n---\n```\n\n## Progress"
+    );
+    const updated = updateTasksContent(content);
+
+    expect(updated).not.toContain("## Not a section");
+    expect(updated.match(/^## Progress$/gm)).toHaveLength(1);
+    expect(updated.slice(updated.indexOf("### Phase 1"))).toBe(
+      content.slice(content.indexOf("### Phase 1"))
+    );
+  });
+});
@@ -0,0 +1,155 @@
+import { afterEach, beforeEach, describe, expect, it } from "vitest";
+import {
+  INSTALL_PHASES,
+  Tracer,
+  combineInstallMetrics,
+  installMetrics,
+  span,
+  toChromeTrace,
+  traceEnabled,
+  type InstallPhase,
+} from "../src/trace.js";
+
+let savedEnv: string | undefined;
+
+beforeEach(() => {
+  savedEnv = process.env.SPEC2IMPL_TRACE;
+  delete process.env.SPEC2IMPL_TRACE;
+});
+
+afterEach(() => {
+  if (savedEnv === undefined) delete process.env.SPEC2IMPL_TRACE;
+  else process.env.SPEC2IMPL_TRACE = savedEnv;
+});
+
+// 少なくとも ms ミリ秒かかる処理
+function busy(ms: number) {
+  const end = performance.now() + ms;
+  while (performance.now() < end);
+}
+
+function tracer(label: string, tid: number): Tracer<InstallPhase> {
+  return new Tracer(INSTALL_PHASES, "install", label, tid);
+}
+
+describe("traceEnabled", () => {
+  it("follows SPEC2IMPL_TRACE when no option is given", () => {
+    expect(traceEnabled()).toBe(false);
+
+    for (const value of ["1", "true", "trace.json"]) {
+      process.env.SPEC2IMPL_TRACE = value;
+      expect(traceEnabled()).toBe(true);
+    }
+    for (const value of ["", "0", "false"]) {
+      process.env.SPEC2IMPL_TRACE = value;
+      expect(traceEnabled()).toBe(false);
+    }
+  });
+
+  it("lets an explicit option override the environment", () => {
+    process.env.SPEC2IMPL_TRACE = "1";
+    expect(traceEnabled(false)).toBe(false);
+
+    delete process.env.SPEC2IMPL_TRACE;
+    expect(traceEnabled(true)).toBe(true);
+  });
+});
+
+describe("Tracer", () => {
+  it("records phases, syscalls and complete events", () => {
+    const trace = tracer("project", 1);
+    trace.count("stat", 3);
+    trace.count("copy");
+    expect(trace.span("copy", () => 42)).toBe(42);
+
+    const metrics = trace.metrics();
+    expect(metrics.syscalls).toMatchObject({ stat: 3, copy: 1, read: 0 });
+    expect(Object.keys(metrics.phases)).toEqual([...INSTALL_PHASES]);
+    expect(metrics.events.map((event) => [event.ph, event.name, event.tid])).toEqual([
+      ["M", "thread_name", 1],
+      ["X", "copy", 1],
+    ]);
+  });
+
+  it("records a phase even when it throws", () => {
+    const trace = tracer("project", 1);
+
+    const fail = () =>
+      trace.span("report", () => {
+        throw new Error("boom");
+      });
+    expect(fail).toThrow("boom");
+    expect(trace.metrics().events).toHaveLength(2);
+  });
+
+  it("runs the function directly without a tracer", () => {
+    expect(span(undefined, "copy", () => "done")).toBe("done");
+  });
+});
+
+describe("installMetrics", () => {
+  it("derives copy totals and attaches shared work only when given", () => {
+    const trace = tracer("project", 1);
+    trace.count("copy", 2);
+    trace.bytes = 2048;
+
+    const metrics = installMetrics(trace);
+    expect(metrics.filesCopied).toBe(2);
+    expect(metrics.bytesCopied).toBe(2048);
+    expect(metrics.filesPerSecond).toBe(0);
+    expect("shared" in metrics).toBe(false);
+
+    const shared = tracer("templates", 0).metrics();
+    expect(installMetrics(trace, shared).shared).toBe(shared);
+  });
+});
+
+describe("toChromeTrace", () => {
+  it("includes the shared scan once across runs, sorted by time", () => {
+    const scan = tracer("templates", 0);
+    scan.span("templateScan", () => undefined);
+    const shared = scan.metrics();
+
+    const runs = ["a", "b"].map((label, index) => {
+      const trace = tracer(label, index + 1);
+      trace.span("targetProbe", () => undefined);
+      return installMetrics(trace, shared);
+    });
+    const { traceEvents } = toChromeTrace(runs);
+
+    expect(traceEvents.filter((event) => event.name === "templateScan")).toHaveLength(1);
+    expect(traceEvents.filter((event) => event.tid === 0)).toHaveLength(2);
+    expect(traceEvents.filter((event) => event.name === "targetProbe")).toHaveLength(2);
+    const times = traceEvents.map((event) => event.ts);
+    expect(times).toEqual([...times].sort((a, b) => a - b));
+  });
+});
+
+describe("combineInstallMetrics", () => {
+  it("sums runs and counts the shared scan once", () => {
+    const scan = tracer("templates", 0);
+    scan.count("readdir", 4);
+    scan.span("templateScan", () => busy(2));
+    const shared = scan.metrics();
+
+    const runs = [1, 2].map((tid) => {
+      const trace = tracer(`project-${tid}`, tid);
+      trace.count("copy", tid);
+      trace.bytes = 100 * tid;
+      trace.span("copy", () => busy(2));
+      return installMetrics(trace, shared);
+    });
+    const total = combineInstallMetrics(runs);
+
+    expect(total.syscalls.readdir).toBe(4);
+    expect(total.syscalls.copy).toBe(3);
+    expect(total.filesCopied).toBe(3);
+    expect(total.bytesCopied).toBe(300);
+    expect(total.phases.templateScan).toBe(shared.phases.templateScan);
+    expect(total.phases.copy).toBe(runs[0].phases.copy + runs[1].phases.copy);
+    // 走査と 2 件のコピーは順に実行されたので、経過時間はその合計以上
+    expect(total.totalMs).toBeGreaterThan(5.9);
+    expect(total.filesPerSecond).toBe((3 * 1000) / total.totalMs);
+    expect(total.shared).toBeUndefined();
+  });
+});
@@ -0,0 +1,15 @@
+import { defineConfig } from "tsup";
+
+export default defineConfig({
+  entry: {
+    cli: "src/cli.ts",
+    index: "src/index.ts",
+    "spec-worker": "src/analyzer/worker.ts",
+  },
+  format: ["esm"],
+  target: "node18",
+  dts: true,
+  clean: true,
+  // dist/cli.js を単一ファイルにする（起動時に共有チャンクを読み込まない）
+  splitting: false,
+});